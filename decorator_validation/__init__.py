@@ -1,2 +1,6 @@
-from .decorators import check_types, make_validator # noqa
-from .types import SkipTypeCheck # noqa
\ No newline at end of file
+from .decorators import check_types, make_validator, cached_validator, warmup # noqa
+from .types import SkipTypeCheck # noqa
+from .config import set_mode, get_mode, set_executor, get_executor # noqa
+from .instrumentation import stats, reset as reset_stats # noqa
+from .records import validated_record # noqa
+from .combinators import all_of, any_of, not_ # noqa
@@ -0,0 +1,87 @@
+"""failures of functions decorated with ``check_types(on_failure="record")``
+
+Instead of raising, such functions record every failed check in a process wide ring buffer and call
+the function anyway. A record is a compact tuple, the error message is only formatted when the buffer is read,
+so a burst of invalid calls costs O(1) per failure. Each function logs a warning with the number of failures
+at most once per ``log_interval`` seconds.
+"""
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, NamedTuple, Tuple
+
+DEFAULT_CAPACITY = 1024
+DEFAULT_LOG_INTERVAL = 60.0
+
+logger = logging.getLogger("decorator_validation")
+
+# (time.time(), function name, parameter name, type of the argument, required annotation)
+_Record = Tuple[float, str, str, type, Any]
+
+# called with (parameter name, argument, required annotation) for a failed check
+Fail = Callable[[str, Any, Any], None]
+
+
+class Failure(NamedTuple):
+    """one recorded failure"""
+
+    timestamp: float
+    function: str
+    parameter: str
+    input_type: type
+    required: Any
+
+    @property
+    def message(self) -> str:
+        from .decorators import _type_error_message
+
+        return f"{self.function}: " + _type_error_message(self.parameter, self.input_type, self.required)
+
+
+_buffer: Deque[_Record] = deque(maxlen=DEFAULT_CAPACITY)
+_log_interval = DEFAULT_LOG_INTERVAL
+
+
+def recorder(function: str) -> Fail:
+    """the function recording the failures of the decorated function named ``function``"""
+    next_log = 0.0
+    suppressed = 0
+
+    def record(parameter: str, arg: Any, required: Any):
+        nonlocal next_log, suppressed
+        now = time.time()
+        _buffer.append((now, function, parameter, type(arg), required))
+        if now < next_log:
+            suppressed += 1
+            return
+        if logger.isEnabledFor(logging.WARNING):
+            message = Failure(now, function, parameter, type(arg), required).message
+            logger.warning("%s (%d more failures since the last report)", message, suppressed)
+        next_log = now + _log_interval
+        suppressed = 0
+
+    return record
+
+
+def failures() -> List[Failure]:
+    """the recorded failures, oldest first"""
+    return [Failure(*record) for record in list(_buffer)]
+
+
+def clear():
+    """remove all recorded failures"""
+    _buffer.clear()
+
+
+def set_capacity(capacity: int):
+    """keep the last ``capacity`` failures, the recorded ones are kept as far as they fit"""
+    global _buffer
+    if capacity < 1:
+        raise ValueError(f"capacity has to be at least 1 but is {capacity}")
+    _buffer = deque(_buffer, maxlen=capacity)
+
+
+def set_log_interval(seconds: float):
+    """minimal seconds between two warnings of the same function, failures in between are only counted"""
+    global _log_interval
+    _log_interval = seconds
@@ -0,0 +1,287 @@
+"""validation of many argument sets of one function at once, column by column
+
+Instead of calling the wrapper once per row, all values of a parameter are checked together:
+``isinstance`` checks against plain classes and ABCs run once per distinct type of the column,
+numpy arrays and ``array.array`` columns are decided from their dtype / typecode in O(1).
+Only custom validators are called per value.
+"""
+import sys
+from itertools import repeat
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from .decorators import _type_error_message
+from .plan import Check
+
+# failures key of the rows that can not be bound to the parameters (missing or unknown arguments)
+ARGUMENTS = "<arguments>"
+
+# check, values of one parameter and the rows they belong to, None if the column has a value for every row
+Column = Tuple[Check, Sequence[Any], Optional[List[int]]]
+
+Rows = Union[Iterable[Union[tuple, list, Mapping[str, Any]]], Mapping[str, Sequence[Any]]]
+
+
+class BatchResult:
+    """outcome of ``validate_batch``
+
+    ``failed`` is a mask with True for every row that failed (a numpy bool array if a column was a numpy array,
+    a list otherwise) and ``failures`` maps every parameter that failed to the indices of its failing rows.
+    Entries of ``*args`` and ``**kwargs`` are keyed like ``args[0]`` or by their keyword, rows that can not be
+    bound to the parameters (like the call would raise) are keyed by ``ARGUMENTS``.
+    The error messages are only formatted when they are read with ``error`` or ``errors``.
+    """
+
+    __slots__ = ("failed", "failures", "_values", "_exceptions", "_required")
+
+    def __init__(
+        self,
+        failed: Any,
+        failures: Dict[str, List[int]],
+        values: Dict[str, Callable[[int], Any]],
+        exceptions: Dict[Tuple[str, int], BaseException],
+        required: Dict[str, Any],
+    ):
+        self.failed = failed
+        self.failures = failures
+        self._values = values
+        self._exceptions = exceptions
+        self._required = required
+
+    @property
+    def ok(self) -> bool:
+        """whether all rows passed"""
+        return not self.failures
+
+    def error(self, row: int) -> Dict[str, str]:
+        """error messages of one row by parameter name, empty if the row passed"""
+        if not self.failed[row]:
+            return {}
+        return {name: self._message(name, row) for name, rows in self.failures.items() if row in rows}
+
+    def errors(self) -> Dict[int, Dict[str, str]]:
+        """error messages of all failing rows by row index and parameter name"""
+        messages: Dict[int, Dict[str, str]] = {}
+        for name, rows in self.failures.items():
+            for row in rows:
+                messages.setdefault(row, {})[name] = self._message(name, row)
+        return dict(sorted(messages.items()))
+
+    def _message(self, name: str, row: int) -> str:
+        exception = self._exceptions.get((name, row))
+        if exception is not None:
+            return f"{type(exception).__name__}: {exception}"
+        return _type_error_message(name, type(self._values[name](row)), self._required[name])
+
+    def __repr__(self):
+        failed = sum(1 for value in self.failed if value)
+        return f"BatchResult(rows={len(self.failed)}, failed={failed}, parameters={sorted(self.failures)})"
+
+
+def validate_batch(func: Callable, rows: Rows) -> BatchResult:
+    """validate many argument sets against the checks of ``func`` without raising
+
+    Parameters
+    ----------
+    func : Callable
+        a function decorated with ``check_types`` (its overrides are used) or any other function
+    rows : Rows
+        an iterable of argument tuples and/or keyword dicts, one per call,
+        or a mapping of parameter name to column (list, ``array.array``, numpy array)
+
+    Returns
+    -------
+    BatchResult
+        the failure mask and the failing rows per parameter
+    """
+    plan = _plan_of(func)
+    if plan.awaited:
+        raise TypeError(f"Async validators for parameters {sorted(plan.awaited)} can not be run in a batch")
+    n_rows, columns, unbound = _columns(plan, rows)
+
+    numpy = sys.modules.get("numpy")
+    use_numpy = numpy is not None and any(isinstance(values, numpy.ndarray) for _, values, _ in columns.values())
+    failed: Any = numpy.zeros(n_rows, dtype=bool) if use_numpy else [False] * n_rows
+    failures: Dict[str, List[int]] = {}
+    exceptions: Dict[Tuple[str, int], BaseException] = {}
+    values: Dict[str, Callable[[int], Any]] = {}
+    required: Dict[str, Any] = {}
+
+    if unbound:
+        failures[ARGUMENTS] = list(unbound)
+        exceptions.update(((ARGUMENTS, row), TypeError(message)) for row, message in unbound.items())
+    for name, ((_, is_typecheck, target, annotation), column, indices) in columns.items():
+        if is_typecheck:
+            positions = _failing_types(column, target)
+        else:
+            positions = _failing_validations(column, target, name, exceptions, indices)
+        if not positions:
+            continue
+        rows_of_name = positions if indices is None else [indices[i] for i in positions]
+        failures[name] = rows_of_name
+        required[name] = annotation
+        values[name] = _value_getter(column, indices)
+    for rows_of_name in failures.values():
+        if use_numpy:
+            failed[rows_of_name] = True
+        else:
+            for row in rows_of_name:
+                failed[row] = True
+    return BatchResult(failed, failures, values, exceptions, required)
+
+
+def _plan_of(func: Callable):
+    build = getattr(func, "__build_plan__", None)
+    if build is not None:
+        return build()
+    from .plan import CheckPlan
+
+    return CheckPlan(func, {})
+
+
+def _columns(plan, rows: Rows) -> Tuple[int, Dict[str, Column], Dict[int, str]]:
+    """turn the rows into one column per checked parameter or ``*args`` / ``**kwargs`` entry
+
+    Also returns the rows that can not be bound to the parameters with the reason, each distinct shape of
+    the rows (number of positional arguments and keywords) is bound once.
+    """
+    shapes: Dict[Tuple[int, Tuple[str, ...]], Optional[str]] = {}
+
+    def binding_error(n_args: int, keys: Iterable[str]) -> Optional[str]:
+        shape = (n_args, tuple(keys))
+        if shape not in shapes:
+            shapes[shape] = _binding_error(plan, *shape)
+        return shapes[shape]
+
+    if isinstance(rows, Mapping):
+        columns = {name: (check, values, None) for name, check, values in _keyword_items(plan, rows.items())}
+        lengths = {len(values) for values in rows.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got lengths {sorted(lengths)}")
+        n_rows = lengths.pop() if lengths else 0
+        error = binding_error(0, rows)
+        return n_rows, columns, ({} if error is None else dict.fromkeys(range(n_rows), error))
+
+    rows = rows if isinstance(rows, list) else list(rows)
+    unbound: Dict[int, str] = {}
+    row_types = set(map(type, rows))
+    if row_types <= {tuple, list}:
+        lengths = set(map(len, rows))
+        if len(lengths) == 1:
+            # all rows pass the same positional arguments, only the checked columns are taken out of the rows
+            n_args = lengths.pop()
+            error = binding_error(n_args, ())
+            if error is not None:
+                unbound = dict.fromkeys(range(len(rows)), error)
+            items = _positional_items(plan, n_args)
+            return len(rows), {name: (check, list(map(itemgetter(i), rows)), None) for i, name, check in items}, unbound
+    if all(issubclass(row_type, Mapping) for row_type in row_types):
+        columns = {}
+        names = dict.fromkeys(key for row in rows for key in row)
+        for name, check, _ in _keyword_items(plan, zip(names, names)):
+            present = [i for i, row in enumerate(rows) if name in row]
+            complete = len(present) == len(rows)
+            columns[name] = (check, [rows[i][name] for i in present], None if complete else present)
+        for i, row in enumerate(rows):
+            error = binding_error(0, row)
+            if error is not None:
+                unbound[i] = error
+        return len(rows), columns, unbound
+
+    # mixed rows, bind every row on its own
+    gathered: Dict[str, Tuple[Check, List[Any], List[int]]] = {}
+    for i, row in enumerate(rows):
+        if isinstance(row, Mapping):
+            error = binding_error(0, row)
+            items = _keyword_items(plan, row.items())
+        else:
+            error = binding_error(len(row), ())
+            items = ((name, check, row[position]) for position, name, check in _positional_items(plan, len(row)))
+        if error is not None:
+            unbound[i] = error
+        for name, check, value in items:
+            _, values, indices = gathered.setdefault(name, (check, [], []))
+            values.append(value)
+            indices.append(i)
+    return len(rows), gathered, unbound
+
+
+def _binding_error(plan, n_args: int, keys: Tuple[str, ...]) -> Optional[str]:
+    """why a call with ``n_args`` positional arguments and the keywords ``keys`` can not be bound, None if it can"""
+    try:
+        plan.signature.bind(*repeat(None, n_args), **dict.fromkeys(keys))
+    except TypeError as error:
+        return str(error)
+    return None
+
+
+def _positional_items(plan, n_args: int) -> Iterator[Tuple[int, str, Check]]:
+    """(position, name, check) of the checked positional arguments of a call with ``n_args`` of them,
+    entries of ``*args`` are named like ``args[0]``"""
+    for i, check in enumerate(plan.positional[:n_args]):
+        if check[2] is not None:
+            yield i, check[0], check
+    var_positional = plan.var_positional
+    if var_positional is not None:
+        n_positional = len(plan.positional)
+        for i in range(n_positional, n_args):
+            entry = var_positional._entry(i - n_positional, None)
+            yield i, entry, (entry, var_positional.is_typecheck, var_positional.target, var_positional.required)
+
+
+def _keyword_items(plan, items: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Check, Any]]:
+    """(name, check, value) of the checked keyword arguments, entries of ``**kwargs`` are named by their keyword"""
+    by_keyword, var_keyword = plan.by_keyword, plan.var_keyword
+    for key, value in items:
+        check = by_keyword.get(key)
+        if check is None and var_keyword is not None:
+            check = key, var_keyword.is_typecheck, var_keyword.target, var_keyword.required
+        if check is not None and check[2] is not None:
+            yield key, check, value
+
+
+def _failing_types(column: Sequence[Any], classinfo: Any) -> List[int]:
+    """positions of the values that are no instances of ``classinfo``"""
+    from .plan import _is_type_based
+    from .std_validators import _elements_match_fast, _is_numpy_array
+
+    # all elements of buffers and numpy arrays (besides object arrays) have the same type
+    matches = _elements_match_fast(column, classinfo)
+    if matches is not None:
+        return [] if matches else list(range(len(column)))
+    if _is_numpy_array(column):
+        column = list(column)
+    if not _is_type_based(classinfo):
+        return [i for i, value in enumerate(column) if not isinstance(value, classinfo)]
+    # the outcome only depends on the type, so each distinct type is checked once
+    wrong = {value_type for value_type in set(map(type, column)) if not issubclass(value_type, classinfo)}
+    if not wrong:
+        return []
+    return [i for i, value_type in enumerate(map(type, column)) if value_type in wrong]
+
+
+def _failing_validations(
+    column: Sequence[Any],
+    validator: Callable[[Any], bool],
+    name: str,
+    exceptions: Dict[Tuple[str, int], BaseException],
+    indices: Optional[List[int]],
+) -> List[int]:
+    """positions of the values the validator rejected, exceptions are kept by (parameter, row)"""
+    positions = []
+    for i, value in enumerate(column):
+        try:
+            valid = validator(value)
+        except Exception as exception:
+            exceptions[name, i if indices is None else indices[i]] = exception
+            valid = False
+        if not valid:
+            positions.append(i)
+    return positions
+
+
+def _value_getter(column: Sequence[Any], indices: Optional[List[int]]) -> Callable[[int], Any]:
+    """value of a parameter by row index"""
+    if indices is None:
+        return column.__getitem__
+    position = {row: i for i, row in enumerate(indices)}
+    return lambda row: column[position[row]]
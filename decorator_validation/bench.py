@@ -0,0 +1,296 @@
+"""benchmarks for the validation overhead of check_types and the std_validators
+
+Run with ``python -m decorator_validation.bench`` and compare the emitted JSON between releases.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from array import array
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import std_validators
+from .decorators import check_types
+from .types import SkipTypeCheck
+
+PARAM_COUNTS = (1, 5, 20)
+CALL_STYLES = ("positional", "keyword", "mixed")
+ANNOTATION_KINDS = ("type", "tuple", "validator", "skip")
+SEQUENCE_SIZES = tuple(10**exponent for exponent in range(1, 8))
+VARARG_COUNTS = (10, 1_000, 100_000)
+THREAD_COUNTS = (1, 2, 4, 8)
+MIN_TIME = 0.05
+
+
+def _time_ns(stmt: Callable[[], Any], repeat: int, min_time: float = MIN_TIME) -> float:
+    """best time of a single execution of ``stmt`` in ns, each repetition runs at least ``min_time`` seconds"""
+    timer = timeit.Timer(stmt)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    return min([elapsed, *timer.repeat(repeat=repeat - 1, number=number)]) / number * 1e9
+
+
+def _make_function(n_params: int) -> Callable:
+    """function with ``n_params`` int annotated parameters"""
+    params = ", ".join(f"p{i}: int" for i in range(n_params))
+    namespace: Dict[str, Any] = {}
+    exec(f"def func({params}):\n    return p0", namespace)
+    return namespace["func"]
+
+
+def _is_int(arg) -> bool:
+    return isinstance(arg, int)
+
+
+def _overrides(kind: str, n_params: int) -> Dict[str, Any]:
+    if kind == "type":
+        return {}
+    override = {"tuple": (int, float), "validator": _is_int, "skip": SkipTypeCheck}[kind]
+    return {f"p{i}": override for i in range(n_params)}
+
+
+def _make_call(func: Callable, n_params: int, style: str) -> Callable[[], Any]:
+    args: Tuple[int, ...] = ()
+    kwargs: Dict[str, int] = {}
+    if style == "positional":
+        args = tuple(range(n_params))
+    elif style == "keyword":
+        kwargs = {f"p{i}": i for i in range(n_params)}
+    else:
+        split = (n_params + 1) // 2
+        args = tuple(range(split))
+        kwargs = {f"p{i}": i for i in range(split, n_params)}
+    return lambda: func(*args, **kwargs)
+
+
+def bench_check_types(repeat: int = 5, min_time: float = MIN_TIME) -> List[Dict[str, Any]]:
+    """overhead of check_types compared to the undecorated function"""
+    results = []
+    for n_params in PARAM_COUNTS:
+        func = _make_function(n_params)
+        for style in CALL_STYLES:
+            baseline = _time_ns(_make_call(func, n_params, style), repeat, min_time)
+            for kind in ANNOTATION_KINDS:
+                for compile in (False, True):
+                    decorated = check_types(compile=compile, **_overrides(kind, n_params))(func)
+                    timed = _time_ns(_make_call(decorated, n_params, style), repeat, min_time)
+                    results.append(
+                        {
+                            "params": n_params,
+                            "call": style,
+                            "annotation": kind,
+                            "wrapper": "compiled" if compile else "generic",
+                            "baseline_ns": baseline,
+                            "decorated_ns": timed,
+                            "overhead_ns": timed - baseline,
+                            "overhead_per_param_ns": (timed - baseline) / n_params,
+                        }
+                    )
+    return results
+
+
+def bench_variadic(
+    counts: Iterable[int] = VARARG_COUNTS, repeat: int = 5, min_time: float = MIN_TIME
+) -> List[Dict[str, Any]]:
+    """overhead of checking the entries of ``*args: int`` and ``**kwargs: int`` for fan-in calls"""
+
+    def func(*args: int, **kwargs: int):
+        return args
+
+    results = []
+    for count in counts:
+        calls = {
+            "args": (tuple(range(count)), {}),
+            "kwargs": ((), {f"k{i}": i for i in range(count)}),
+        }
+        for variadic, (args, kwargs) in calls.items():
+            baseline = _time_ns(lambda: func(*args, **kwargs), repeat, min_time)
+            for compile in (False, True):
+                decorated = check_types(compile=compile)(func)
+                timed = _time_ns(lambda: decorated(*args, **kwargs), repeat, min_time)
+                results.append(
+                    {
+                        "entries": count,
+                        "variadic": variadic,
+                        "wrapper": "compiled" if compile else "generic",
+                        "baseline_ns": baseline,
+                        "decorated_ns": timed,
+                        "overhead_per_entry_ns": (timed - baseline) / count,
+                    }
+                )
+    return results
+
+
+def _gil_enabled() -> bool:
+    """whether the GIL is enabled, False only on free-threaded builds running without it"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _threaded_ns(call: Callable[[], Any], n_threads: int, n_calls: int, repeat: int) -> float:
+    """best wall time in ns of ``n_threads`` threads each calling ``call`` ``n_calls`` times, started together"""
+    best = float("inf")
+    for _ in range(repeat):
+        barrier = threading.Barrier(n_threads + 1)
+
+        def work():
+            barrier.wait()
+            for _ in range(n_calls):
+                call()
+
+        threads = [threading.Thread(target=work) for _ in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter_ns()
+        for thread in threads:
+            thread.join()
+        best = min(best, time.perf_counter_ns() - start)
+    return best
+
+
+def bench_threads(
+    thread_counts: Iterable[int] = THREAD_COUNTS, repeat: int = 5, min_time: float = MIN_TIME
+) -> List[Dict[str, Any]]:
+    """throughput of one decorated function called from many threads at once
+
+    Every thread makes the same number of calls, so without contention the wall time stays flat and the
+    throughput grows with the thread count. With the GIL it can't grow, on free-threaded builds
+    ``scaling`` (throughput relative to one thread) shows whether the calls contend on shared state.
+    """
+    n_params = 5
+    func = _make_function(n_params)
+    args = tuple(range(n_params))
+    # calls per thread such that a single thread runs about min_time seconds
+    n_calls = max(1, int(min_time * 1e9 / _time_ns(lambda: func(*args), 1, min_time)))
+    results = []
+    for wrapper, decorated in (
+        ("none", func),
+        ("generic", check_types(compile=False)(func)),
+        ("compiled", check_types(compile=True)(func)),
+    ):
+        single = None
+        for n_threads in thread_counts:
+            elapsed = _threaded_ns(partial(decorated, *args), n_threads, n_calls, repeat)
+            throughput = n_threads * n_calls / elapsed * 1e9
+            single = single or throughput
+            results.append(
+                {
+                    "threads": n_threads,
+                    "wrapper": wrapper,
+                    "calls_per_thread": n_calls,
+                    "wall_ns": elapsed,
+                    "calls_per_s": throughput,
+                    "scaling": throughput / single,
+                }
+            )
+    return results
+
+
+def _sequence_validators() -> Dict[str, Callable[[Any], bool]]:
+    return {
+        "is_sequence_of": std_validators.is_sequence_of(int),
+        "is_iterable_of": std_validators.is_iterable_of(int),
+    }
+
+
+def _scalar_validators(files: List[Path]) -> Dict[str, Callable[[], Any]]:
+    file = files[0]
+    return {
+        "is_file": lambda: std_validators.is_file(str(file)),
+        "is_file_cached": lambda: std_validators.is_file_cached(str(file)),
+        f"are_files[{len(files)}]": lambda: std_validators.are_files(files),
+        "is_num_as_str": lambda: std_validators.is_num_as_str("1.5e3"),
+        "is_num_as_str[invalid]": lambda: std_validators.is_num_as_str("n/a"),
+    }
+
+
+def bench_std_validators(
+    sizes: Iterable[int] = SEQUENCE_SIZES, repeat: int = 3, min_time: float = MIN_TIME
+) -> List[Dict[str, Any]]:
+    """time of the std_validators, sequence validators for each size as list and as buffer"""
+    results = []
+    for size in sizes:
+        inputs = {"list": list(range(size)), "array": array("q", range(size))}
+        for input_name, data in inputs.items():
+            for name, validator in _sequence_validators().items():
+                timed = _time_ns(lambda: validator(data), repeat, min_time)
+                results.append({"validator": name, "input": input_name, "size": size, "ns": timed})
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    if numpy is not None:
+        validator = std_validators.is_array(dtype=float, finite=True, range=(0, 1))
+        for size in sizes:
+            data = numpy.random.default_rng(0).random(size)
+            timed = _time_ns(lambda: validator(data), repeat, min_time)
+            results.append({"validator": "is_array[finite, range]", "input": "ndarray", "size": size, "ns": timed})
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = [Path(directory) / f"bench_{i}.txt" for i in range(100)]
+        for file in files:
+            file.write_text("bench")
+        for name, call in _scalar_validators(files).items():
+            results.append({"validator": name, "input": None, "size": None, "ns": _time_ns(call, repeat, min_time)})
+    return results
+
+
+def _package_version() -> Optional[str]:
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:  # pragma: no cover
+        return None
+    try:
+        return version("decorator_validation")
+    except PackageNotFoundError:
+        return None
+
+
+def run(sizes: Iterable[int] = SEQUENCE_SIZES, repeat: int = 5, min_time: float = MIN_TIME) -> Dict[str, Any]:
+    """run all benchmarks and return the results as JSON serializable dict"""
+    return {
+        "meta": {
+            "version": _package_version(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "gil": _gil_enabled(),
+        },
+        "check_types": bench_check_types(repeat, min_time),
+        "variadic": bench_variadic(VARARG_COUNTS, repeat, min_time),
+        "threads": bench_threads(THREAD_COUNTS, repeat, min_time),
+        "std_validators": bench_std_validators(sizes, max(1, repeat // 2), min_time),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-size", type=int, default=SEQUENCE_SIZES[-1], help="largest sequence size")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per measurement, the best is reported")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="minimal seconds per repetition")
+    parser.add_argument("--output", "-o", type=Path, default=None, help="write JSON to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in SEQUENCE_SIZES if size <= args.max_size]
+    results = json.dumps(run(sizes, args.repeat, args.min_time), indent=2)
+    if args.output is None:
+        sys.stdout.write(results + "\n")
+    else:
+        args.output.write_text(results + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import inspect
+import linecache
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+from . import config as _config
+from .config import ALWAYS, OFF, Mode
+from .plan import Check, CheckPlan, VariadicCheck
+
+# prefix for all names the generated code binds, keeps them apart from the parameter names
+_PREFIX = "_dv_"
+
+_counter = itertools.count()
+
+
+class _Missing:
+    """sentinel for parameters that were not passed"""
+
+    def __repr__(self):
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+
+def _indent(code: str, level: int) -> str:
+    return "\n".join("    " * level + line for line in code.splitlines())
+
+
+def _check_lines(check: Check, namespace: Dict[str, Any], bound: List[str]) -> List[str]:
+    """lines checking (and substituting) the local of the checked parameter, indented by the caller
+
+    The classinfo or validator is added to ``namespace`` and its keyword-only default to ``bound``.
+    """
+    name, is_typecheck, target, _ = check
+    lines = []
+    if target is not None:
+        target_name = f"{_PREFIX}check_{name}"
+        bound.append(f"{target_name}={target_name}")
+        namespace[target_name] = target
+        test = f"{_PREFIX}isinstance({name}, {target_name})" if is_typecheck else f"{target_name}({name})"
+        lines.append(f"if not {test}:\n    {_PREFIX}fail({name!r}, {name})")
+    if not is_typecheck and hasattr(target, "substitute"):
+        substitute_name = f"{_PREFIX}substitute_{name}"
+        namespace[substitute_name] = target.substitute
+        lines.append(f"{name} = {substitute_name}({name})")
+    return lines
+
+
+def _variadic_lines(
+    param: inspect.Parameter, check: Optional[VariadicCheck], namespace: Dict[str, Any], bound: List[str]
+) -> List[str]:
+    """lines checking the entries of the ``*args`` or ``**kwargs`` local in one call of the ``VariadicCheck``,
+    entries with a validator that substitutes them are substituted one by one"""
+    if check is None:
+        return []
+    name = param.name
+    check_name = f"{_PREFIX}check_{name}"
+    bound.append(f"{check_name}={check_name}")
+    namespace[check_name] = check
+    if param.kind == param.VAR_POSITIONAL:
+        lines = [f"if {name}:", f"    {check_name}({name}, {_PREFIX}fail_entry)"]
+    else:
+        lines = [f"if {name}:", f"    {check_name}({_PREFIX}list({name}.values()), {_PREFIX}fail_entry, False, {name})"]
+    if not check.is_typecheck and hasattr(check.target, "substitute"):
+        substitute = check.target.substitute
+        substitute_name = f"{_PREFIX}substitute_{name}"
+        if param.kind == param.VAR_POSITIONAL:
+            namespace[substitute_name] = lambda values: tuple(map(substitute, values))
+        else:
+            namespace[substitute_name] = lambda values: {key: substitute(value) for key, value in values.items()}
+        lines.append(f"    {name} = {substitute_name}({name})")
+    return ["\n".join(lines)]
+
+
+def _gate(mode_name: str) -> str:
+    """``if`` statement entered by calls that are not validated in the mode bound to ``mode_name``"""
+    m = f"{_PREFIX}m"
+    return (
+        f"{m} = {mode_name} or {_PREFIX}config._mode\n"
+        + f"if {m} is not {_PREFIX}always and ({m} is {_PREFIX}off"
+        + f" or {_PREFIX}next({_PREFIX}counter) * {m}.share % {m}.period >= {m}.share):"
+    )
+
+
+def _builtins() -> Dict[str, Any]:
+    """builtins the generated code calls, bound under prefixed names so parameters can't shadow them"""
+    return {f"{_PREFIX}isinstance": isinstance, f"{_PREFIX}next": next, f"{_PREFIX}list": list}
+
+
+def _exec(source: str, name: str, qualname: str, namespace: Dict[str, Any]) -> Callable:
+    """compile ``source`` and return the function ``name`` defined by it"""
+    filename = f"<check_types {qualname}-{next(_counter)}>"
+    exec(compile(source, filename, "exec"), namespace)
+    # register the source so tracebacks and debuggers can show the generated code
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    return namespace[name]
+
+
+def compile_wrapper(
+    func: Callable, plan: CheckPlan, fail: Callable[[str, Any, Any], None], mode: Optional[Mode] = None
+) -> Optional[Callable]:
+    """generate a wrapper specialized to the exact signature of ``func``
+
+    The generated function takes the same parameters as ``func`` and runs straight-line checks on the
+    named locals. Classinfos and validators are bound as keyword-only default arguments, so every check
+    is a local lookup plus a bare ``isinstance`` or validator call (the same pattern attrs and dataclasses use).
+    ``*args`` and ``**kwargs`` receive exactly the extra arguments, their entries are checked in a single call.
+
+    Parameters
+    ----------
+    func : Callable
+        the decorated function
+    plan : CheckPlan
+        the check plan of ``func``
+    fail : Callable[[str, Any, Any], None]
+        called with parameter (or entry) name, argument and required annotation if a check fails, has to raise
+    mode : Optional[Mode]
+        validation mode of the function, ``None`` follows the process wide mode
+
+    Returns
+    -------
+    Optional[Callable]
+        the wrapper or ``None`` if the checks (expensive validators, overrides of ``**kwargs`` entries)
+        are not supported
+    """
+    if plan.deferred:
+        return None
+    params = list(plan.signature.parameters.values())
+    if any(name.startswith(_PREFIX) for name in plan.keyword):
+        return None  # the names would collide with the names the generated code binds
+    if len(plan.keyword) > len(params):
+        return None  # overrides of single ``**kwargs`` entries are checked by the generic wrapper
+    keyword = plan.keyword
+
+    def fail_parameter(name: str, arg: Any):
+        fail(name, arg, keyword[name][3])
+
+    namespace: Dict[str, Any] = {
+        f"{_PREFIX}func": func,
+        f"{_PREFIX}fail": fail_parameter,
+        f"{_PREFIX}fail_entry": fail,
+        f"{_PREFIX}missing": MISSING,
+        f"{_PREFIX}config": _config,
+        f"{_PREFIX}mode": mode,
+        f"{_PREFIX}always": ALWAYS,
+        f"{_PREFIX}off": OFF,
+        f"{_PREFIX}counter": itertools.count(),
+        **_builtins(),
+    }
+    header: List[str] = []
+    bound: List[str] = []  # keyword-only defaults holding classinfos and validators
+    body: List[str] = []
+    fill: List[str] = []  # fills in defaults of calls that are not validated
+    call: List[str] = []
+    var_keyword: List[str] = []  # **kwargs has to follow the bound keyword-only defaults
+    previous_kind = None
+
+    for param in params:
+        name = param.name
+        # reproduce the "/" and "*" markers of the original signature
+        if previous_kind == param.POSITIONAL_ONLY and param.kind != param.POSITIONAL_ONLY:
+            header.append("/")
+        if param.kind == param.KEYWORD_ONLY and previous_kind not in (param.KEYWORD_ONLY, param.VAR_POSITIONAL):
+            header.append("*")
+        previous_kind = param.kind
+
+        if param.kind == param.VAR_POSITIONAL:
+            header.append(f"*{name}")
+            body.extend(_indent(line, 1) for line in _variadic_lines(param, plan.var_positional, namespace, bound))
+            call.append(f"*{name}")
+            continue
+        if param.kind == param.VAR_KEYWORD:
+            var_keyword.append(f"**{name}")
+            body.extend(_indent(line, 1) for line in _variadic_lines(param, plan.var_keyword, namespace, bound))
+            call.append(f"**{name}")
+            continue
+
+        checked = _check_lines(plan.keyword[name], namespace, bound)
+
+        if param.default is param.empty:
+            header.append(name)
+            body.extend(_indent(line, 1) for line in checked)
+        else:
+            default_name = f"{_PREFIX}default_{name}"
+            namespace[default_name] = param.default
+            header.append(f"{name}={_PREFIX}missing")
+            fill_default = f"if {name} is {_PREFIX}missing:\n    {name} = {default_name}"
+            body.append(_indent(fill_default, 1))
+            fill.append(_indent(fill_default, 2))
+            if checked:
+                body.append(_indent("else:", 1))
+                body.extend(_indent(line, 2) for line in checked)
+
+        call.append(f"{name}={name}" if param.kind == param.KEYWORD_ONLY else name)
+
+    if previous_kind == inspect.Parameter.POSITIONAL_ONLY:
+        header.append("/")
+    if bound:
+        if not any(p.kind in (p.KEYWORD_ONLY, p.VAR_POSITIONAL) for p in params):
+            header.append("*")
+        header.extend(bound)
+    header.extend(var_keyword)
+
+    func_call = f"{_PREFIX}func({', '.join(call)})"
+    gate = [_indent(_gate(f"{_PREFIX}mode"), 1), *fill, f"        return {func_call}"]
+    # defined under a private name, the name of func could shadow a builtin or name bound in the namespace
+    source = "\n".join([f"def {_PREFIX}wrapper({', '.join(header)}):", *gate, *body, f"    return {func_call}"])
+    wrapper = _exec(source, f"{_PREFIX}wrapper", func.__qualname__, namespace)
+    wrapper.__name__, wrapper.__qualname__ = func.__name__, func.__qualname__
+    return wrapper
@@ -0,0 +1,225 @@
+"""combinators building one flat validator out of several (``all_of``, ``any_of``, ``not_``)
+
+Members can be validators (returning a bool or raising, e.g. made with ``make_validator``), classes, tuples of
+classes or typing annotations. Nested combinators of the same kind are flattened into a single loop,
+so combining adds one call layer no matter how deep the expression is.
+``all_of`` merges the file checks of ``std_validators`` (``is_file``, ``has_magic``, ...) into one ``os.stat``.
+
+With ``adaptive=True`` a combinator measures cost and outcome of its members during a short window
+every ``period`` calls and reorders them, so cheap members that decide the outcome most often run first.
+"""
+import itertools
+import time
+from typing import Any, Callable, List, Tuple
+from .typing_checks import is_typing_construct, translate
+
+# calls between two measurements of an adaptive combinator
+ADAPT_PERIOD = 4096
+# number of measured calls, in which all members run
+ADAPT_WINDOW = 64
+
+# (position in the combinator, is isinstance check, classinfo or validator, the member as given)
+_Member = Tuple[int, bool, Any, Any]
+
+
+def all_of(*validators: Any, adaptive: bool = False, period: int = ADAPT_PERIOD, window: int = ADAPT_WINDOW):
+    """validator passing if all ``validators`` pass, stops at the first one that fails
+
+    Exceptions raised by members count as failure, the combined validator returns a bool.
+
+    Parameters
+    ----------
+    validators : Any
+        validators, classes, tuples of classes or typing annotations
+    adaptive : bool
+        reorder the members by measured cost and rejection rate, by default False
+    period : int
+        calls between two measurements in adaptive mode, by default ADAPT_PERIOD
+    window : int
+        number of measured calls in adaptive mode, by default ADAPT_WINDOW
+    """
+    return _combine("all_of", validators, adaptive, period, window)
+
+
+def any_of(*validators: Any, adaptive: bool = False, period: int = ADAPT_PERIOD, window: int = ADAPT_WINDOW):
+    """validator passing if any of the ``validators`` passes, stops at the first one that passes
+
+    Classes and tuples of classes are merged into a single ``isinstance`` check that runs first.
+    Exceptions raised by members count as failure, the combined validator returns a bool.
+    See ``all_of`` for the parameters.
+    """
+    return _combine("any_of", validators, adaptive, period, window)
+
+
+def not_(validator: Any) -> Callable[[Any], bool]:
+    """validator passing if ``validator`` fails (returns False or raises)"""
+    inverted = getattr(validator, "inverted", None)
+    if inverted is not None:
+        return inverted
+    [(_, is_typecheck, target, _)] = _members("not_", (validator,))
+
+    def check_fn(arg) -> bool:
+        try:
+            return not (isinstance(arg, target) if is_typecheck else target(arg))
+        except Exception:
+            return True
+
+    check_fn.inverted = validator
+    _copy_marks(check_fn, [validator])
+    return check_fn
+
+
+def _members(kind: str, validators: Tuple[Any, ...]) -> List[_Member]:
+    """flatten nested combinators of the same kind and translate classes and annotations into checks"""
+    members: List[_Member] = []
+    for validator in validators:
+        if getattr(validator, "combinator", None) == kind:
+            members.extend(_members(kind, validator.validators))
+            continue
+        if isinstance(validator, (type, tuple)) or not callable(validator) or is_typing_construct(validator):
+            translation = translate(validator)
+            is_typecheck, target = translation if translation is not None else (True, object)
+        else:
+            is_typecheck, target = False, validator
+        if not is_typecheck and _is_async(target):
+            raise TypeError(f"Async validator {target!r} can not be combined")
+        members.append((len(members), is_typecheck, target, validator))
+    return members
+
+
+def _is_async(target: Callable) -> bool:
+    from .decorators import _is_coroutine_function
+
+    return _is_coroutine_function(target) or _is_coroutine_function(getattr(target, "__call__", None))
+
+
+def _merge_file_checks(members: List[_Member]) -> List[_Member]:
+    """members checking a file (``is_file``, ``std_validators.has_magic``, ...) are merged into a single member
+    at the position of the first one, so the path is only stat-ed and the file only opened once"""
+    file_checks = [validator.file_check for *_, validator in members if hasattr(validator, "file_check")]
+    if len(file_checks) < 2:
+        return members
+    from .std_validators import check_file
+
+    def check_fn(file) -> bool:
+        check_file(file, file_checks)
+        return True
+
+    merged: List[_Member] = []
+    pending = True
+    for member in members:
+        if not hasattr(member[3], "file_check"):
+            merged.append(member)
+        elif pending:
+            merged.append((member[0], False, check_fn, check_fn))
+            pending = False
+    return merged
+
+
+def _copy_marks(check_fn: Callable, validators: List[Any]):
+    """the combined validator is expensive if one of its members is"""
+    if any(getattr(validator, "expensive", False) is True for validator in validators):
+        check_fn.expensive = True
+
+
+def _combine(kind: str, validators: Tuple[Any, ...], adaptive: bool, period: int, window: int) -> Callable:
+    if not validators:
+        raise ValueError(f"{kind} needs at least one validator")
+    if adaptive and not 0 < window <= period:
+        raise ValueError(f"window has to be in (0, period] but is {window}")
+    members = _members(kind, validators)
+    flattened = tuple(validator for *_, validator in members)
+    if kind == "any_of":
+        # a single isinstance check against all classes decides most inputs cheaply
+        classinfo = tuple(
+            cls
+            for _, is_typecheck, target, _ in members
+            if is_typecheck
+            for cls in (target if isinstance(target, tuple) else (target,))
+        )
+        if classinfo:
+            members = [(0, True, classinfo, classinfo)] + [member for member in members if not member[1]]
+    else:
+        members = _merge_file_checks([member for member in members if member[2] is not object])  # typing.Any
+    members = [(i, is_typecheck, target, validator) for i, (_, is_typecheck, target, validator) in enumerate(members)]
+
+    stop = kind == "any_of"  # outcome of a member that decides the result
+    order = tuple(members)
+
+    if stop:
+
+        def run(arg) -> bool:
+            for _, is_typecheck, target, _ in order:
+                try:
+                    if isinstance(arg, target) if is_typecheck else target(arg):
+                        return True
+                except Exception:
+                    pass
+            return False
+
+    else:
+
+        def run(arg) -> bool:
+            for _, is_typecheck, target, _ in order:
+                try:
+                    if not (isinstance(arg, target) if is_typecheck else target(arg)):
+                        return False
+                except Exception:
+                    return False
+            return True
+
+    if not adaptive:
+        check_fn = run
+    else:
+        calls = itertools.count()
+        # per member: evaluations, outcomes deciding the result, ns spent
+        evaluations = [0] * len(members)
+        decisive = [0] * len(members)
+        spent = [0] * len(members)
+
+        def reorder():
+            nonlocal order
+
+            def expected_cost(member: _Member) -> float:
+                i = member[0]
+                cost = spent[i] / max(evaluations[i], 1)
+                # cost to reach a decision, members that rarely decide anything go last
+                return cost / max(decisive[i] / max(evaluations[i], 1), 1e-3)
+
+            order = tuple(sorted(order, key=expected_cost))
+            for counters in (evaluations, decisive, spent):
+                counters[:] = [0] * len(counters)
+
+        def measure(arg, last: bool) -> bool:
+            # all members run, to measure the ones that would be skipped as well
+            result = not stop
+            for i, is_typecheck, target, _ in order:
+                start = time.perf_counter_ns()
+                try:
+                    valid = isinstance(arg, target) if is_typecheck else target(arg)
+                except Exception:
+                    valid = False
+                spent[i] += time.perf_counter_ns() - start
+                evaluations[i] += 1
+                if bool(valid) is stop:
+                    decisive[i] += 1
+                    result = stop
+            if last:
+                reorder()
+            return result
+
+        def check_fn(arg) -> bool:
+            position = next(calls) % period
+            if position < window:
+                return measure(arg, position == window - 1)
+            return run(arg)
+
+    def current_order() -> List[Any]:
+        """the members as given, in the order they currently run"""
+        return [validator for *_, validator in order]
+
+    check_fn.combinator = kind
+    check_fn.validators = flattened
+    check_fn.order = current_order
+    _copy_marks(check_fn, list(flattened))
+    return check_fn
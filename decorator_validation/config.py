@@ -0,0 +1,119 @@
+"""process wide configuration of check_types
+
+The validation mode is read from the environment variable ``DECORATOR_VALIDATION_MODE`` at import
+and can be changed at runtime with ``set_mode``. Possible modes are
+
+- ``"always"``: validate every call (default)
+- ``"off"``: validate nothing, ``check_types`` returns the undecorated function
+- ``"sample(rate)"``: validate only the fraction ``rate`` of the calls of a function, spread evenly
+
+Validators marked as expensive (``make_validator(expensive=True)``) run in parallel on the executor
+set with ``set_executor``, unless a function has its own ``check_types(executor=...)``.
+"""
+import os
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+ENV_VAR = "DECORATOR_VALIDATION_MODE"
+# sampling rates are rounded to fractions with at most this denominator
+MAX_PERIOD = 10**6
+
+
+class Mode:
+    """validation mode, use the module constants ``ALWAYS``, ``OFF`` or ``sample(rate)``"""
+
+    __slots__ = ("name", "rate", "share", "period")
+
+    def __init__(self, name: str, rate: float = 1.0):
+        self.name = name
+        self.rate = rate
+        # a cheap counter decides which calls are validated, the k-th call is if k * share % period < share,
+        # that is ``share`` out of each ``period`` calls, spread evenly
+        if rate in (0, 1):
+            self.share, self.period = int(rate), 1
+            return
+        # fractions (and decimal) are only loaded for sampling, importing the package stays cheap
+        from fractions import Fraction
+
+        fraction = Fraction(rate).limit_denominator(MAX_PERIOD) or Fraction(1, MAX_PERIOD)
+        self.share = fraction.numerator
+        self.period = fraction.denominator
+
+    def __repr__(self):
+        if self.name == "sample":
+            return f"sample({self.rate})"
+        return self.name
+
+
+ALWAYS = Mode("always")
+OFF = Mode("off", 0.0)
+
+
+def sample(rate: float) -> Mode:
+    """mode validating only a fraction ``rate`` of the calls of a function
+
+    Parameters
+    ----------
+    rate : float
+        fraction of validated calls in (0, 1]
+    """
+    if not 0 < rate <= 1:
+        raise ValueError(f"Sampling rate has to be in (0, 1] but is {rate}")
+    if rate == 1:
+        return ALWAYS
+    return Mode("sample", rate)
+
+
+def parse_mode(mode: Union[str, Mode]) -> Mode:
+    """turn a mode or its string representation (``"off"``, ``"always"``, ``"sample(0.1)"``) into a mode"""
+    if isinstance(mode, Mode):
+        return mode
+    if not isinstance(mode, str):
+        raise TypeError(f"Mode has to be a str or Mode but is {type(mode)}")
+    normalized = mode.strip().lower()
+    if normalized == "always":
+        return ALWAYS
+    if normalized == "off":
+        return OFF
+    if normalized.startswith("sample(") and normalized.endswith(")"):
+        try:
+            rate = float(normalized[len("sample(") : -1])
+        except ValueError:
+            pass
+        else:
+            return sample(rate)
+    raise ValueError(f"Unknown validation mode {mode!r}, use 'always', 'off' or 'sample(rate)'")
+
+
+def set_mode(mode: Union[str, Mode]):
+    """set the process wide validation mode
+
+    Functions decorated while the mode is ``off`` stay undecorated, all others follow the mode at call time.
+    """
+    global _mode
+    _mode = parse_mode(mode)
+
+
+def get_mode() -> Mode:
+    """get the process wide validation mode"""
+    return _mode
+
+
+def set_executor(executor: Optional["Executor"]):
+    """set the process wide executor running expensive validators, ``None`` runs them in the calling thread
+
+    The executor is looked up at call time, so it applies to all decorated functions.
+    """
+    global _executor
+    _executor = executor
+
+
+def get_executor() -> Optional["Executor"]:
+    """get the process wide executor running expensive validators"""
+    return _executor
+
+
+_mode = parse_mode(os.environ.get(ENV_VAR, "always"))
+_executor: Optional["Executor"] = None
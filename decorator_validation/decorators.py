@@ -1,70 +1,715 @@
-from functools import wraps
-from typing import Callable, Any
-import inspect
-from .helpers import Annotation
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from functools import partial, wraps
+from typing import TYPE_CHECKING, Callable, Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from types import ModuleType
+from . import config as _config
+from . import instrumentation as _instrumentation
+from .config import ALWAYS, OFF, Mode, parse_mode
+from .typing_checks import DEFAULT_DEPTH, DEFAULT_SAMPLE
+
+# the plan (inspect) and asyncio are only imported when they are needed, to keep the import of the package fast
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from .audit import Fail
+    from .batch import BatchResult, Rows
+    from .plan import CheckPlan, VariadicCheck
+
+# keywords that configure check_types itself, with their defaults
+_OPTIONS = {
+    "compile": False,
+    "mode": None,
+    "timeout": None,
+    "depth": DEFAULT_DEPTH,
+    "sample": DEFAULT_SAMPLE,
+    "instrument": None,
+    "fingerprint": None,
+    "executor": None,
+    "on_failure": "raise",
+}
+
+ON_FAILURE = ("raise", "record")
+
+# maximal number of argument type combinations remembered as valid per function
+FINGERPRINT_CACHE_SIZE = 64
+# with fingerprint=None, functions with at least this many ABC checks remember valid argument types
+_FINGERPRINT_MIN_ABC_CHECKS = 2
+
+_CO_COROUTINE = 0x80  # inspect.CO_COROUTINE
 
 
 class check_types:
-    """Decorator to automatically check input types of a function based on type annotation"""
+    """Decorator to automatically check input types of a function based on type annotation
+
+    Besides the override kwargs the following options are accepted:
+
+    - ``compile``: generate a wrapper specialized to the signature of the function (default False)
+    - ``mode``: validation mode of this function (``"always"``, ``"off"`` or ``"sample(rate)"``),
+      overrides the process wide mode of ``decorator_validation.config`` (default None)
+    - ``timeout``: seconds the async validators of a call may take together (default None)
+    - ``depth``: how many nested containers of typing annotations like ``List[Dict[str, int]]``
+      have their elements checked (default 3)
+    - ``sample``: how many elements of each such container are checked, None checks all (default None)
+    - ``instrument``: record validation stats of this function (see ``decorator_validation.instrumentation``),
+      None follows ``instrumentation.is_enabled()`` at decoration (default None)
+    - ``fingerprint``: if all checks of a function are ``isinstance`` checks, remember up to
+      ``FINGERPRINT_CACHE_SIZE`` combinations of argument types that passed and skip the checks for them.
+      None enables it for functions with several (slow) ABC checks like ``Sequence`` (default None).
+      Functions with ``*args`` or ``**kwargs`` are not fingerprinted, their entries are checked once per
+      distinct type anyway and would make the key as long as the call.
+    - ``executor``: ``concurrent.futures.Executor`` running the expensive validators of this function,
+      None uses ``config.get_executor()`` at call time (default None)
+    - ``on_failure``: ``"raise"`` a TypeError for invalid arguments or ``"record"`` the failure in the ring buffer
+      of ``decorator_validation.audit`` and call the function anyway, validators that raise count as failed
+      (default "raise")
+
+    An option keyword is treated as an override if its value is a type, tuple or validator,
+    so parameters of the same name can still be overridden.
+
+    A validator with a ``substitute`` attribute replaces the validated argument by ``substitute(arg)``
+    before it is passed to the function (see ``std_validators.is_iterable_of(..., stream=True)``).
+
+    Validators marked as expensive (``make_validator(expensive=True)`` or an ``expensive = True`` attribute) run
+    after all other checks of a call passed, in parallel on the executor if there is one. If several of them fail,
+    the failure of the first parameter is raised.
+
+    ``async def`` functions get an async wrapper. Their validators may be async as well, the async validators
+    of a call run concurrently after all other checks passed.
+
+    Decoration is O(1), the check plan of a function is built on its first call (or by ``warmup``).
+    Only ``compile=True`` builds it at decoration, as the generated wrapper depends on it.
+    """
 
     def __new__(cls, func=None, **kwargs):
         # support for @check_types instead of @check_types()
         if func is not None:
-            instance = super().__new__(cls, **kwargs)
-            instance._override_kwargs = kwargs
+            instance = super().__new__(cls)
+            instance.__init__(**kwargs)
             return instance(func)
         return super().__new__(cls)
 
     def __init__(self, **override_kwargs):
+        self._options = dict(_OPTIONS)
+        for name in _OPTIONS:
+            if name in override_kwargs and not _is_override(override_kwargs[name]):
+                self._options[name] = override_kwargs.pop(name)
+        if self._options["on_failure"] not in ON_FAILURE:
+            raise ValueError(f"on_failure has to be one of {ON_FAILURE} but is {self._options['on_failure']!r}")
         self._override_kwargs = override_kwargs
 
     def __call__(self, func):
+        own_mode = None if self._options["mode"] is None else parse_mode(self._options["mode"])
+        if (own_mode or _config.get_mode()) is OFF:
+            return func
+
+        instrument = self._options["instrument"]
+        if instrument is None:
+            instrument = _instrumentation.is_enabled()
+        stats = _instrumentation.register(func) if instrument else None
+
+        fail = _raise_type_error
+        if self._options["on_failure"] == "record":
+            from .audit import recorder
+
+            fail = recorder(f"{func.__module__}.{func.__qualname__}")
+
+        is_async = _is_coroutine_function(func)
+        # signature, overrides and checks are resolved once, a call only runs the bare checks
+        build = _PlanBuilder(func, self._override_kwargs, self._options["depth"], self._options["sample"], is_async)
+
+        inner = None
+        if is_async:
+            inner = self._wrap_async(func, build, own_mode, stats, fail)
+        elif stats is not None:
+            inner = self._wrap_checked(func, build, own_mode, stats, fail)
+        elif self._options["compile"] and fail is _raise_type_error:
+            inner = self._wrap_compiled(func, build, own_mode)
+        if inner is None:
+            inner = self._wrap(func, build, own_mode, fail)
+
+        inner.__build_plan__ = build
+        return inner
+
+    @staticmethod
+    def validate_batch(func: Callable, rows: "Rows") -> "BatchResult":
+        """validate many argument sets of ``func`` column by column and return the failures instead of raising,
+        see ``decorator_validation.batch.validate_batch``"""
+        from .batch import validate_batch
+
+        return validate_batch(func, rows)
+
+    def _wrap_compiled(self, func: Callable, build: "_PlanBuilder", own_mode: Optional[Mode]) -> Optional[Callable]:
+        from .codegen import compile_wrapper
+
+        compiled = compile_wrapper(func, build(), _raise_type_error, own_mode)
+        return None if compiled is None else wraps(func)(compiled)
+
+    def _wrap(
+        self, func: Callable, build: "_PlanBuilder", own_mode: Optional[Mode], fail: Optional["Fail"] = None
+    ) -> Callable:
+        fail = fail or _raise_type_error
+        plan = positional = by_keyword = var_positional = var_keyword = substitutions = deferred = fingerprints = None
+        n_positional = 0
+        counter = itertools.count()
+        # a fail function that does not raise records failures, validators that raise count as failed then
+        guard = fail is not _raise_type_error
+        fingerprint = False if guard else self._options["fingerprint"]
+        executor = self._options["executor"]
+        timeout = self._options["timeout"]
+
         @wraps(func)
         def inner(*args, **kwargs):
-            _signature = inspect.signature(func)
-
-            # check all arguments
-            for param, arg in zip(_signature.parameters.values(), args):
-                # check if an override occured for the parameter
-                override = self._override_kwargs.get(param.name, None)
+            nonlocal plan, positional, by_keyword, var_positional, var_keyword, n_positional
+            nonlocal substitutions, deferred, fingerprints
+            mode = own_mode or _config._mode
+            if mode is not ALWAYS and (mode is OFF or next(counter) * mode.share % mode.period >= mode.share):
+                return func(*args, **kwargs)
+            if plan is None:
+                built = build()
+                positional, by_keyword, substitutions = built.positional, built.by_keyword, built.substitutions
+                var_positional, var_keyword, n_positional = built.var_positional, built.var_keyword, len(positional)
+                deferred = built.deferred
+                # keys of variadic calls would grow with the number of entries
+                variadic = built.var_positional is not None or built.var_keyword is not None
+                if built.type_only and fingerprint is not False and not variadic:
+                    if fingerprint or built.abc_checks >= _FINGERPRINT_MIN_ABC_CHECKS:
+                        fingerprints = set()
+                plan = built  # set last, other threads use the locals once plan is set
 
-                if not override:
-                    annotation = Annotation(param.annotation, Annotation.SIGNATURE)  # default signature
+            # the outcome of type only checks is known for argument types that passed before
+            if fingerprints is not None:
+                if kwargs:
+                    key = (tuple(map(type, args)), tuple(kwargs), tuple(map(type, kwargs.values())))
                 else:
-                    annotation = Annotation(override, Annotation.OVERRIDE)  # override instead of signature
+                    key = tuple(map(type, args))
+                if key in fingerprints:
+                    return func(*args, **kwargs)
 
-                # type does not match the annotation
-                if not annotation.matches(arg):
-                    raise TypeError(
-                        f"TypeError for Parameter {param.name}: input_type: {type(arg)}: required: {annotation.annotation}\n"
-                        + "Make sure your custom validator did not fail if you used one!"
-                    )
+            if deferred:
+                pending = _check_arguments(plan, args, kwargs, None, fail)
+                _run_deferred(pending, executor or _config._executor, timeout, None, fail)
+                if substitutions:
+                    args, kwargs = plan.substitute(args, kwargs)
+                return func(*args, **kwargs)
+
+            # check all arguments
+            for (name, is_typecheck, target, required), arg in zip(positional, args):
+                if target is None:
+                    continue
+                try:
+                    valid = isinstance(arg, target) if is_typecheck else target(arg)
+                except Exception:
+                    if not guard:
+                        raise
+                    valid = False
+                if not valid:
+                    fail(name, arg, required)
+            if var_positional is not None and len(args) > n_positional:
+                var_positional(args[n_positional:], fail, guard)
 
             # check all kwargs
             for k, v in kwargs.items():
-                if k not in self._override_kwargs:
-                    annotation = Annotation(_signature.parameters[k].annotation, Annotation.SIGNATURE)
-                else:
-                    annotation = Annotation(self._override_kwargs[k], Annotation.OVERRIDE)
+                check = by_keyword.get(k)
+                if check is None:
+                    continue
+                name, is_typecheck, target, required = check
+                if target is None:
+                    continue
+                try:
+                    valid = isinstance(v, target) if is_typecheck else target(v)
+                except Exception:
+                    if not guard:
+                        raise
+                    valid = False
+                if not valid:
+                    fail(name, v, required)
+            if var_keyword is not None and kwargs:
+                extra = {k: v for k, v in kwargs.items() if k not in by_keyword} if by_keyword else kwargs
+                if extra:
+                    var_keyword(list(extra.values()), fail, guard, extra)
 
-                # type does not match the annotation
-                if not annotation.matches(v):
-                    raise TypeError(
-                        f"TypeError for Parameter {k}: input_type: {type(v)}: required: {annotation.annotation}\n"
-                        + "Make sure your custom validator did not fail if you used one!"
-                    )
+            if fingerprints is not None and len(fingerprints) < FINGERPRINT_CACHE_SIZE:
+                fingerprints.add(key)
+            if substitutions:
+                args, kwargs = plan.substitute(args, kwargs)
             return func(*args, **kwargs)
 
         return inner
 
+    def _wrap_checked(
+        self,
+        func: Callable,
+        build: "_PlanBuilder",
+        own_mode: Optional[Mode],
+        stats: Optional["_instrumentation.FunctionStats"],
+        fail: "Fail",
+    ) -> Callable:
+        """wrapper running the checks one by one, to record stats or failures"""
+        counter = itertools.count()
+        executor = self._options["executor"]
+        timeout = self._options["timeout"]
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            mode = own_mode or _config._mode
+            if mode is not ALWAYS and (mode is OFF or next(counter) * mode.share % mode.period >= mode.share):
+                return func(*args, **kwargs)
+
+            plan = build()
+            start = time.perf_counter_ns()
+            failed = True
+            try:
+                pending = _check_arguments(plan, args, kwargs, stats, fail)
+                if pending:
+                    _run_deferred(pending, executor or _config._executor, timeout, stats, fail)
+                failed = False
+            finally:
+                if stats is not None:
+                    stats.record(time.perf_counter_ns() - start, failed)
+            if plan.substitutions:
+                args, kwargs = plan.substitute(args, kwargs)
+            return func(*args, **kwargs)
+
+        return inner
+
+    def _wrap_async(
+        self,
+        func: Callable,
+        build: "_PlanBuilder",
+        own_mode: Optional[Mode],
+        stats: Optional["_instrumentation.FunctionStats"] = None,
+        fail: Optional["Fail"] = None,
+    ) -> Callable:
+        fail = fail or _raise_type_error
+        timeout = self._options["timeout"]
+        executor = self._options["executor"]
+        counter = itertools.count()
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            mode = own_mode or _config._mode
+            if mode is not ALWAYS and (mode is OFF or next(counter) * mode.share % mode.period >= mode.share):
+                return await func(*args, **kwargs)
+
+            plan = build()
+            start = time.perf_counter_ns()
+            failed = True
+            try:
+                pending = _check_arguments(plan, args, kwargs, stats, fail)
+                if pending:
+                    await _await_checks(plan, pending, executor or _config._executor, timeout, stats, fail)
+                failed = False
+            finally:
+                if stats is not None:
+                    stats.record(time.perf_counter_ns() - start, failed)
+            if plan.substitutions:
+                args, kwargs = plan.substitute(args, kwargs)
+            return await func(*args, **kwargs)
+
+        return inner
+
+
+class _PlanBuilder:
+    """builds the check plan of a decorated function once, on first use"""
+
+    __slots__ = ("func", "override_kwargs", "depth", "sample", "is_async", "plan", "lock")
+
+    def __init__(self, func: Callable, override_kwargs: dict, depth: int, sample: Optional[int], is_async: bool):
+        self.func = func
+        self.override_kwargs = override_kwargs
+        self.depth = depth
+        self.sample = sample
+        self.is_async = is_async
+        self.plan: Optional["CheckPlan"] = None
+        self.lock = threading.Lock()
+
+    def __call__(self) -> "CheckPlan":
+        plan = self.plan
+        if plan is not None:
+            return plan
+        with self.lock:
+            if self.plan is None:
+                from .plan import CheckPlan
+
+                plan = CheckPlan(self.func, self.override_kwargs, self.depth, self.sample)
+                if plan.awaited and not self.is_async:
+                    raise TypeError(
+                        f"Async validators for parameters {sorted(plan.awaited)} "
+                        + f"require {self.func.__qualname__} to be async"
+                    )
+                self.plan = plan
+        return self.plan
+
+
+def warmup(
+    targets: Union[ModuleType, Callable, Iterable[Callable]], background: bool = False
+) -> Union[int, threading.Thread]:
+    """build the check plans of decorated functions now instead of on their first call
+
+    Parameters
+    ----------
+    targets : Union[ModuleType, Callable, Iterable[Callable]]
+        a module (all decorated functions and methods of the classes in it), a decorated function
+        or an iterable of them
+    background : bool
+        build the plans in a daemon thread, by default False
+
+    Returns
+    -------
+    Union[int, threading.Thread]
+        the number of warmed up functions, or the started thread if ``background`` is True
+    """
+    if isinstance(targets, ModuleType):
+        builders = list(_builders_of_module(targets))
+    elif callable(targets):
+        builders = [builder for builder in [getattr(targets, "__build_plan__", None)] if builder is not None]
+    else:
+        builders = [target.__build_plan__ for target in targets if hasattr(target, "__build_plan__")]
+
+    def build_all() -> int:
+        for build in builders:
+            build()
+        return len(builders)
 
-def make_validator(func: Callable[[Any], None]) -> Callable[[Any], bool]:
+    if background:
+        thread = threading.Thread(target=build_all, name="decorator_validation.warmup", daemon=True)
+        thread.start()
+        return thread
+    return build_all()
+
+
+def _builders_of_module(module: ModuleType) -> Iterable["_PlanBuilder"]:
+    for value in list(vars(module).values()):
+        members = list(vars(value).values()) if isinstance(value, type) else [value]
+        for member in members:
+            member = getattr(member, "__func__", member)  # staticmethod / classmethod
+            builder = getattr(member, "__build_plan__", None)
+            if isinstance(builder, _PlanBuilder):
+                yield builder
+
+
+def _is_coroutine_function(func: Callable) -> bool:
+    """inspect.iscoroutinefunction without importing inspect"""
+    while isinstance(func, partial):
+        func = func.func
+    func = getattr(func, "__func__", func)
+    code = getattr(func, "__code__", None)
+    return bool(code is not None and code.co_flags & _CO_COROUTINE) or hasattr(func, "_is_coroutine_marker")
+
+
+# (parameter name, argument, required annotation, async or expensive validator)
+_PendingCheck = Tuple[str, Any, Any, Callable]
+
+
+def _check_arguments(
+    plan: "CheckPlan",
+    args: tuple,
+    kwargs: dict,
+    stats: Optional["_instrumentation.FunctionStats"] = None,
+    fail: Optional["Fail"] = None,
+) -> List[_PendingCheck]:
+    """run all cheap sync checks of a call and return the deferred ones (async and expensive validators)
+    in parameter order, they are not started yet
+
+    If ``stats`` are given every check is recorded, custom validators with the time they took.
+    ``fail`` is called for failed checks, by default it raises a TypeError. If it does not raise,
+    validators that raise count as failed as well.
+    """
+    fail = fail or _raise_type_error
+    guard = fail is not _raise_type_error
+    pending: Dict[str, List[_PendingCheck]] = {}
+    checks = zip(plan.positional, args)
+    by_keyword = plan.by_keyword
+    keyword_checks = ((by_keyword[k], v) for k, v in kwargs.items() if k in by_keyword)
+    for (name, is_typecheck, target, required), arg in itertools.chain(checks, keyword_checks):
+        if target is None:
+            continue
+        if name in plan.deferred:
+            pending[name] = [(name, arg, required, target)]
+        elif stats is None and not guard:
+            if not (isinstance(arg, target) if is_typecheck else target(arg)):
+                fail(name, arg, required)
+        elif is_typecheck:
+            valid = isinstance(arg, target)
+            if stats is not None:
+                stats.record_parameter(name, 0, not valid)
+            if not valid:
+                fail(name, arg, required)
+        elif not _validate(name, target, arg, stats, guard):
+            fail(name, arg, required)
+
+    variadic = []
+    if plan.var_positional is not None and len(args) > len(plan.positional):
+        variadic.append((plan.var_positional, args[len(plan.positional) :], None))
+    if plan.var_keyword is not None and kwargs:
+        extra = {k: v for k, v in kwargs.items() if k not in by_keyword}
+        if extra:
+            variadic.append((plan.var_keyword, list(extra.values()), extra))
+    for check, values, keys in variadic:
+        if check.name in plan.deferred:
+            entries = check.entries(values, keys)
+            pending[check.name] = [(entry, value, check.required, check.target) for entry, value in entries]
+        else:
+            _check_variadic(check, values, keys, stats, fail, guard)
+
+    if len(pending) > 1:
+        return [check for name in plan.keyword if name in pending for check in pending[name]]
+    return [check for checks_of_name in pending.values() for check in checks_of_name]
+
+
+def _check_variadic(
+    check: "VariadicCheck",
+    values: Sequence[Any],
+    keys: Optional[Iterable[str]],
+    stats: Optional["_instrumentation.FunctionStats"],
+    fail: "Fail",
+    guard: bool,
+):
+    """check the entries of ``*args`` or ``**kwargs``, if ``stats`` are given they are recorded as one check"""
+    if stats is None:
+        check(values, fail, guard, keys)
+        return
+    failed = False
+
+    def record(entry: str, arg: Any, required: Any):
+        nonlocal failed
+        failed = True
+        fail(entry, arg, required)
+
+    start = time.perf_counter_ns()
+    try:
+        check(values, record, guard, keys)
+    except Exception:
+        failed = True
+        raise
+    finally:
+        stats.record_parameter(check.name, time.perf_counter_ns() - start, failed)
+
+
+def _validate(
+    name: str,
+    target: Callable,
+    arg: Any,
+    stats: Optional["_instrumentation.FunctionStats"] = None,
+    guard: bool = False,
+) -> bool:
+    """call a sync validator, recording the time it took if ``stats`` are given
+
+    With ``guard`` exceptions of the validator count as failure instead of being raised.
+    """
+    if guard:
+        try:
+            return _validate(name, target, arg, stats)
+        except Exception:
+            return False
+    if stats is None:
+        return target(arg)
+    start = time.perf_counter_ns()
+    valid = False
+    try:
+        valid = target(arg)
+    finally:
+        stats.record_parameter(name, time.perf_counter_ns() - start, not valid)
+    return valid
+
+
+def _run_deferred(
+    pending: List[_PendingCheck],
+    executor: Optional["Executor"],
+    timeout: Optional[float],
+    stats: Optional["_instrumentation.FunctionStats"] = None,
+    fail: Optional["Fail"] = None,
+):
+    """run expensive validators, in parallel if an executor is given, the first failure in parameter order is raised"""
+    fail = fail or _raise_type_error
+    guard = fail is not _raise_type_error
+    if executor is None:
+        for name, arg, required, target in pending:
+            if not _validate(name, target, arg, stats, guard):
+                fail(name, arg, required)
+        return
+
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+
+    futures = [executor.submit(_validate, name, target, arg, stats, guard) for name, arg, _, target in pending]
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        for (name, arg, required, _), future in zip(pending, futures):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                valid = future.result(remaining)
+            except FutureTimeoutError:
+                if future.done():  # raised by the validator itself
+                    raise
+                names = [name for name, *_ in pending]
+                raise FutureTimeoutError(f"Validation of parameters {names} did not finish within {timeout}s") from None
+            if not valid:
+                fail(name, arg, required)
+    finally:
+        for future in futures:
+            future.cancel()  # validators of later parameters are not needed after a failure
+
+
+async def _await_checks(
+    plan: "CheckPlan",
+    pending: List[_PendingCheck],
+    executor: Optional["Executor"],
+    timeout: Optional[float],
+    stats: Optional["_instrumentation.FunctionStats"] = None,
+    fail: Optional["Fail"] = None,
+):
+    """run async validators concurrently and expensive ones on the executor, failures are raised in parameter order"""
+    import asyncio
+
+    fail = fail or _raise_type_error
+    guard = fail is not _raise_type_error
+
+    async def run_inline(name, target, arg):
+        return _validate(name, target, arg, stats, guard)
+
+    # entries of *args and **kwargs are pending by their entry name, so the async validators are known by identity
+    awaited = [plan.keyword[name][2] for name in plan.awaited]
+    awaitables = []
+    for name, arg, _, target in pending:
+        if any(target is validator for validator in awaited):
+            awaitables.append(target(arg))
+        elif executor is not None:
+            awaitables.append(asyncio.wrap_future(executor.submit(_validate, name, target, arg, stats, guard)))
+        else:
+            awaitables.append(run_inline(name, target, arg))
+    gathered = asyncio.gather(*awaitables, return_exceptions=True)
+    try:
+        results = await asyncio.wait_for(gathered, timeout)
+    except asyncio.TimeoutError:
+        names = [name for name, *_ in pending]
+        raise asyncio.TimeoutError(f"Validation of parameters {names} did not finish within {timeout}s") from None
+    for (name, arg, required, _), result in zip(pending, results):
+        if isinstance(result, BaseException) and not (guard and isinstance(result, Exception)):
+            raise result
+        if not result or isinstance(result, BaseException):
+            fail(name, arg, required)
+
+
+def _is_override(value: Any) -> bool:
+    """overrides are types, tuples of types or validators"""
+    return isinstance(value, (type, tuple)) or callable(value)
+
+
+def _type_error_message(name: str, input_type: type, required: Any) -> str:
+    return (
+        f"TypeError for Parameter {name}: input_type: {input_type}: required: {required}\n"
+        + "Make sure your custom validator did not fail if you used one!"
+    )
+
+
+def _raise_type_error(name: str, arg: Any, required: Any):
+    raise TypeError(_type_error_message(name, type(arg), required))
+
+
+def make_validator(func: Optional[Callable[[Any], None]] = None, *, expensive: bool = False) -> Callable[[Any], bool]:
     """takes in function that raises error for wrong type and makes it return
-    True if no exception occurs"""
+    True if no exception occurs, async functions give async validators
+
+    ``make_validator(expensive=True)`` marks the validator as expensive (e.g. I/O bound), ``check_types`` runs
+    such validators after all cheap checks passed and in parallel on its executor if there is one.
+    """
+    if func is None:
+        return partial(make_validator, expensive=expensive)
+
+    if _is_coroutine_function(func):
+
+        @wraps(func)
+        async def inner_async(*args, **kwargs):
+            await func(*args, **kwargs)
+            return True
+
+        return inner_async
 
     @wraps(func)
     def inner(*args, **kwargs):
         func(*args, **kwargs)
         return True
 
+    if expensive:
+        inner.expensive = True
     return inner
+
+
+class CacheInfo(NamedTuple):
+    """statistics of a ``cached_validator``"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def cached_validator(maxsize: int = 1024, ttl: Optional[float] = None) -> Callable[[Callable], Callable]:
+    """cache the positive results of an expensive validator (e.g. made with ``make_validator``)
+
+    Only inputs that passed are cached, failing inputs are validated again on every call.
+    Unhashable inputs are never cached.
+
+    Parameters
+    ----------
+    maxsize : int
+        maximal number of cached inputs, the least recently used one is evicted first, by default 1024
+    ttl : Optional[float]
+        seconds after which a cached input is validated again, by default None (never)
+
+    Returns
+    -------
+    Callable[[Callable], Callable]
+        decorator for the validator, the cached validator has ``cache_info()`` and ``cache_clear()`` methods
+    """
+    if maxsize < 1:
+        raise ValueError(f"maxsize has to be at least 1 but is {maxsize}")
+
+    def decorator(func: Callable[..., bool]) -> Callable[..., bool]:
+        cache: "OrderedDict[Any, Optional[float]]" = OrderedDict()  # key -> expiry time
+        lock = threading.Lock()
+        hits = misses = 0
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            nonlocal hits, misses
+            key = args if not kwargs else (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+
+            with lock:
+                expires = cache.get(key, False)
+                if expires is not False and (expires is None or expires > time.monotonic()):
+                    cache.move_to_end(key)
+                    hits += 1
+                    return True
+                misses += 1
+
+            valid = func(*args, **kwargs)
+            if valid:
+                with lock:
+                    cache[key] = None if ttl is None else time.monotonic() + ttl
+                    cache.move_to_end(key)
+                    if len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return valid
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(hits, misses, maxsize, len(cache))
+
+        def cache_clear():
+            nonlocal hits, misses
+            with lock:
+                cache.clear()
+                hits = misses = 0
+
+        inner.cache_info = cache_info
+        inner.cache_clear = cache_clear
+        return inner
+
+    return decorator
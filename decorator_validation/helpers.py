@@ -1,10 +1,16 @@
 import inspect
-from typing import Callable, Tuple, Union, Any
+from typing import Callable, Tuple, Union, Any, Optional
 from .types import SkipTypeCheck
+from .typing_checks import DEFAULT_DEPTH, DEFAULT_SAMPLE, Translation, is_typing_construct, translate
 
 
 class Validator:
-    """Class that handles type validation of non-default annotations"""
+    """Class that handles type validation of non-default annotations
+
+    Validators are immutable and keep no state between calls, so one instance can be shared by threads.
+    """
+
+    __slots__ = ("validator",)
 
     TYPECHECK = 0
     CALLABLE_CHECK = 1
@@ -19,7 +25,35 @@ class Validator:
         """
         if isinstance(validator, type):
             validator = (validator,)
-        self.validator = validator
+        object.__setattr__(self, "validator", validator)
+
+    def checker(self, depth: int = DEFAULT_DEPTH, sample: Optional[int] = DEFAULT_SAMPLE) -> Optional[Tuple[int, Any]]:
+        """resolve the validator into a bare check
+
+        Typing annotations (like ``List[int]``) are translated into composed checks, see ``typing_checks``.
+
+        Parameters
+        ----------
+        depth : int
+            how many nested containers of typing annotations have their elements checked
+        sample : Optional[int]
+            how many elements of each container are checked, None checks all
+
+        Returns
+        -------
+        Optional[Tuple[int, Any]]
+            ``None`` if nothing has to be checked, else ``(TYPECHECK, classinfo)`` for an ``isinstance`` check
+            or ``(CALLABLE_CHECK, callable)`` for a validator function
+        """
+        if isinstance(self.validator, tuple) and SkipTypeCheck in self.validator:
+            return None
+        if is_typing_construct(self.validator):
+            return _from_translation(translate(self.validator, depth, sample))
+        if isinstance(self.validator, tuple):
+            return self.TYPECHECK, self.validator
+        if self.validator is None:
+            return None
+        return self.CALLABLE_CHECK, self.validator
 
     def validate(self, input) -> Tuple[int, bool]:
         if isinstance(self.validator, tuple):
@@ -32,9 +66,20 @@ class Validator:
                 valid = self.validator(input)
         return type_of_check, valid
 
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 class Annotation:
-    """annotation class handles typecheck for a type-annotation"""
+    """annotation class handles typecheck for a type-annotation
+
+    Annotations are immutable and keep no state between calls, so one instance can be shared by threads.
+    """
+
+    __slots__ = ("annotation", "type")
 
     OVERRIDE = 0
     SIGNATURE = 1
@@ -49,24 +94,39 @@ class Annotation:
         type : int
             Either Annotation.OVERRIDE or Annotation.SIGNATURE
         """
-        self.annotation = annotation
-        self.type = type_
+        # allow single typing
+        if type_ == Annotation.OVERRIDE and isinstance(annotation, type):
+            annotation = (annotation,)
+        object.__setattr__(self, "annotation", annotation)
+        object.__setattr__(self, "type", type_)
 
-    def matches(self, arg) -> bool:
+    def checker(self, depth: int = DEFAULT_DEPTH, sample: Optional[int] = DEFAULT_SAMPLE) -> Optional[Tuple[int, Any]]:
+        """resolve the annotation into a bare check, see ``Validator.checker``"""
         if self.type == Annotation.SIGNATURE:
-            # in case of default signature: check if type matches annotation
-            # in case of no annotation -> ok
-            return self.annotation == inspect._empty or isinstance(arg, self.annotation)
-        elif self.type == Annotation.OVERRIDE:
-            # when override create validator object
-            #
-            validator = Validator(self.annotation)
-            type_of_check, res = validator.validate(arg)
-
-            # allow single typing
-            if  isinstance(self.annotation, type):
-                self.annotation = (self.annotation,)
-
-            if type_of_check == Validator.TYPECHECK and SkipTypeCheck in self.annotation:
-                return True
-            return res
+            # in case of no annotation -> nothing to check
+            if self.annotation == inspect._empty:
+                return None
+            return _from_translation(translate(self.annotation, depth, sample))
+        return Validator(self.annotation).checker(depth, sample)
+
+    def matches(self, arg) -> bool:
+        checker = self.checker()
+        if checker is None:
+            return True
+        type_of_check, target = checker
+        if type_of_check == Validator.TYPECHECK:
+            return isinstance(arg, target)
+        return target(arg)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+def _from_translation(translation: Translation) -> Optional[Tuple[int, Any]]:
+    if translation is None:
+        return None
+    is_typecheck, target = translation
+    return (Validator.TYPECHECK if is_typecheck else Validator.CALLABLE_CHECK), target
@@ -0,0 +1,148 @@
+"""opt-in instrumentation of the validation done by check_types
+
+Functions decorated while instrumentation is enabled (or with ``check_types(instrument=True)``) record per function
+and per parameter how often they were validated, how often validation failed and how long it took.
+All other functions get the plain wrapper, so instrumentation costs nothing unless it is used.
+
+Instrumentation is enabled by ``enable()`` or by setting the environment variable ``DECORATOR_VALIDATION_STATS=1``
+before the decorated functions are imported.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+ENV_VAR = "DECORATOR_VALIDATION_STATS"
+
+# called with (function name, ns spent in validation, whether validation failed) after every instrumented call
+Hook = Callable[[str, int, bool], None]
+
+
+class ParameterStats:
+    """counters of one parameter, ``total_ns`` / ``max_ns`` measure custom validators only"""
+
+    __slots__ = ("calls", "failures", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FunctionStats:
+    """counters of one decorated function"""
+
+    __slots__ = ("name", "calls", "failures", "total_ns", "max_ns", "parameters", "lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.parameters: Dict[str, ParameterStats] = {}
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.parameters.clear()
+
+    def parameter(self, name: str) -> ParameterStats:
+        stats = self.parameters.get(name)
+        if stats is None:
+            stats = self.parameters.setdefault(name, ParameterStats())
+        return stats
+
+    def record(self, elapsed_ns: int, failed: bool):
+        """record one validated call"""
+        with self.lock:
+            self.calls += 1
+            self.failures += failed
+            self.total_ns += elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+        hook = _hook
+        if hook is not None:
+            hook(self.name, elapsed_ns, failed)
+
+    def record_parameter(self, name: str, elapsed_ns: int, failed: bool):
+        """record one check of parameter ``name``"""
+        with self.lock:
+            stats = self.parameter(name)
+            stats.calls += 1
+            stats.failures += failed
+            stats.total_ns += elapsed_ns
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "total_ns": self.total_ns,
+                "max_ns": self.max_ns,
+                "parameters": {name: stats.as_dict() for name, stats in self.parameters.items()},
+            }
+
+
+_registry: Dict[str, FunctionStats] = {}
+_registry_lock = threading.Lock()
+_hook: Optional[Hook] = None
+_enabled = os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable():
+    """instrument all functions decorated from now on"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """stop instrumenting functions decorated from now on, instrumented ones keep recording"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_hook(hook: Optional[Hook]):
+    """set a callback ``hook(function_name, elapsed_ns, failed)`` called after every instrumented validation,
+    e.g. to forward the data to a metrics system. ``None`` removes the hook."""
+    global _hook
+    _hook = hook
+
+
+def register(func: Callable) -> FunctionStats:
+    """the stats of a decorated function, functions with the same qualified name share them"""
+    name = f"{func.__module__}.{func.__qualname__}"
+    with _registry_lock:
+        stats = _registry.get(name)
+        if stats is None:
+            stats = _registry[name] = FunctionStats(name)
+    return stats
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """snapshot of the counters of all instrumented functions by qualified name
+
+    Every function has ``calls``, ``failures``, ``total_ns`` and ``max_ns`` spent in validation and ``parameters``
+    with the same counters per parameter, where the times measure custom validators only.
+    """
+    with _registry_lock:
+        registered = list(_registry.values())
+    return {function_stats.name: function_stats.as_dict() for function_stats in registered}
+
+
+def reset():
+    """set all counters to zero"""
+    with _registry_lock:
+        registered = list(_registry.values())
+    for function_stats in registered:
+        with function_stats.lock:
+            function_stats.reset()
@@ -0,0 +1,276 @@
+import inspect
+import typing
+from abc import ABCMeta
+from itertools import repeat
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+from .helpers import Annotation, Validator
+from .typing_checks import DEFAULT_DEPTH, DEFAULT_SAMPLE
+
+# (parameter name, is isinstance check, classinfo or validator (None if unchecked), required annotation)
+Check = Tuple[str, bool, Any, Any]
+# (positional index or None if keyword only, parameter name, substitute function of the validator),
+# for ``*args`` the index of its first entry, for ``**kwargs`` None, all their entries are substituted
+Substitution = Tuple[Optional[int], str, Callable[[Any], Any]]
+
+_VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+_VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+
+
+class VariadicCheck:
+    """check of the entries of a ``*args`` or ``**kwargs`` parameter against the annotation of the parameter
+
+    The annotation of ``*args: int`` applies to every entry, so all entries are checked in one tight loop.
+    If the outcome depends on the type only, each distinct type is checked once.
+    With ``sample`` only about ``sample`` entries, evenly spread, are checked.
+    Entries are named ``args[i]`` (index into ``*args``) or by their keyword in error messages.
+    """
+
+    __slots__ = ("name", "is_typecheck", "target", "required", "by_type", "sample")
+
+    def __init__(self, check: Check, sample: Optional[int]):
+        self.name, self.is_typecheck, self.target, self.required = check
+        self.by_type = self.is_typecheck and _is_type_based(self.target)
+        self.sample = sample
+
+    def __call__(
+        self,
+        values: Sequence[Any],
+        fail: Callable[[str, Any, Any], None],
+        guard: bool = False,
+        keys: Optional[Iterable[str]] = None,
+    ):
+        """check the entries ``values``, ``keys`` are their keywords (only read on failure) for ``**kwargs``
+
+        ``fail`` is called with entry name, value and annotation for each failed entry.
+        With ``guard`` exceptions of the validator count as failure instead of being raised.
+        """
+        step = self._step(len(values))
+        checked = values[::step] if step > 1 else values
+        target = self.target
+        if self.is_typecheck:
+            if self.by_type:
+                if all(issubclass(value_type, target) for value_type in set(map(type, checked))):
+                    return
+            elif all(map(isinstance, checked, repeat(target))):
+                return
+            for i, value in enumerate(checked):
+                if not isinstance(value, target):
+                    fail(self._entry(i * step, keys), value, self.required)
+            return
+        for i, value in enumerate(checked):
+            try:
+                valid = target(value)
+            except Exception:
+                if not guard:
+                    raise
+                valid = False
+            if not valid:
+                fail(self._entry(i * step, keys), value, self.required)
+
+    def entries(self, values: Sequence[Any], keys: Optional[Iterable[str]] = None) -> List[Tuple[str, Any]]:
+        """the checked entries as (entry name, value), for validators that run deferred"""
+        step = self._step(len(values))
+        names = list(keys) if keys is not None else None
+        return [(self._entry(i, names), values[i]) for i in range(0, len(values), step)]
+
+    def _step(self, n_values: int) -> int:
+        return 1 if self.sample is None or n_values <= self.sample else n_values // self.sample
+
+    def _entry(self, i: int, keys: Optional[Iterable[str]]) -> str:
+        if keys is None:
+            return f"{self.name}[{i}]"
+        return keys[i] if isinstance(keys, list) else list(keys)[i]
+
+
+class CheckPlan:
+    """Immutable set of checks for one function, built once on its first validated call (or by ``warmup``)
+
+    ``compile=True`` builds it at decoration, as the generated wrapper depends on it.
+
+    The signature, the override kwargs and the per-parameter checks are resolved here so that
+    a call only has to run the bare ``isinstance`` checks and validator functions.
+
+    Checks of parameters whose validator is async or marked as expensive (``expensive = True``) are deferred,
+    they run after all other checks of a call passed.
+
+    Validators with a ``substitute`` attribute replace the argument they validated by the result of
+    ``substitute(arg)``, e.g. to validate a stream lazily while the function consumes it.
+
+    The binding of arguments to parameters is precomputed as well: ``positional`` holds the checks of the
+    positional slots in order, ``by_keyword`` the checks of the parameters a keyword argument binds to.
+    Extra positional and keyword arguments are checked by ``var_positional`` and ``var_keyword``.
+    """
+
+    __slots__ = (
+        "signature",
+        "positional",
+        "keyword",
+        "by_keyword",
+        "var_positional",
+        "var_keyword",
+        "substitutions",
+        "awaited",
+        "expensive",
+        "deferred",
+        "type_only",
+        "abc_checks",
+    )
+
+    signature: inspect.Signature
+    positional: Tuple[Check, ...]  # checks of the positional slots (without ``*args``)
+    keyword: Mapping[str, Check]  # checks by parameter name, for ``*args`` and ``**kwargs`` of their entries
+    by_keyword: Mapping[str, Check]  # checks of the parameters that can be passed by keyword
+    var_positional: Optional[VariadicCheck]  # check of the entries of ``*args``, None if there is none
+    var_keyword: Optional[VariadicCheck]  # check of the entries of ``**kwargs``, None if there is none
+    substitutions: Tuple[Substitution, ...]
+    awaited: FrozenSet[str]  # parameters with async validators
+    expensive: FrozenSet[str]  # parameters with sync validators marked as expensive
+    deferred: FrozenSet[str]  # parameters checked after all others, the union of awaited and expensive
+    type_only: bool  # whether the outcome of all checks depends on the types of the arguments only
+    abc_checks: int  # number of (comparably slow) checks against abstract base classes like Sequence
+
+    def __init__(
+        self,
+        func: Callable,
+        override_kwargs: Dict[str, Any],
+        depth: int = DEFAULT_DEPTH,
+        sample: Optional[int] = DEFAULT_SAMPLE,
+    ):
+        """build the plan
+
+        Parameters
+        ----------
+        func : Callable
+            the decorated function
+        override_kwargs : Dict[str, Any]
+            the override kwargs passed to ``check_types``
+        depth : int
+            how many nested containers of typing annotations have their elements checked
+        sample : Optional[int]
+            how many elements of each container are checked, None checks all
+        """
+        signature = inspect.signature(func)
+        annotations = _resolve_annotations(func, {name: p.annotation for name, p in signature.parameters.items()})
+        keyword = {}
+        for name in signature.parameters:
+            if name in override_kwargs:
+                annotation = Annotation(override_kwargs[name], Annotation.OVERRIDE)
+            else:
+                annotation = Annotation(annotations[name], Annotation.SIGNATURE)
+            keyword[name] = _make_check(name, annotation, depth, sample)
+        for name, override in override_kwargs.items():
+            if name not in keyword:
+                keyword[name] = _make_check(name, Annotation(override, Annotation.OVERRIDE), depth, sample)
+
+        parameters = signature.parameters.values()
+        positional_names = [p.name for p in parameters if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        variadic = {p.kind: p.name for p in parameters if p.kind in (_VAR_POSITIONAL, _VAR_KEYWORD)}
+        # keyword arguments named like positional-only or variadic parameters end up in **kwargs
+        not_by_keyword = {p.name for p in parameters if p.kind == p.POSITIONAL_ONLY} | set(variadic.values())
+        substitutions = []
+        for name, (_, is_typecheck, target, _) in keyword.items():
+            if not is_typecheck and hasattr(target, "substitute"):
+                if name == variadic.get(_VAR_POSITIONAL):
+                    index = len(positional_names)
+                else:
+                    index = positional_names.index(name) if name in positional_names else None
+                substitutions.append((index, name, target.substitute))
+
+        object.__setattr__(self, "signature", signature)
+        object.__setattr__(self, "positional", tuple(keyword[name] for name in positional_names))
+        object.__setattr__(self, "keyword", MappingProxyType(keyword))
+        object.__setattr__(
+            self,
+            "by_keyword",
+            MappingProxyType({name: check for name, check in keyword.items() if name not in not_by_keyword}),
+        )
+        for kind, slot in ((_VAR_POSITIONAL, "var_positional"), (_VAR_KEYWORD, "var_keyword")):
+            check = keyword[variadic[kind]] if kind in variadic else None
+            object.__setattr__(self, slot, None if check is None or check[2] is None else VariadicCheck(check, sample))
+        object.__setattr__(self, "substitutions", tuple(substitutions))
+        object.__setattr__(
+            self,
+            "awaited",
+            frozenset(name for name, is_typecheck, target, _ in keyword.values() if _is_async(is_typecheck, target)),
+        )
+        expensive = [name for name, is_typecheck, target, _ in keyword.values() if _is_expensive(is_typecheck, target)]
+        object.__setattr__(self, "expensive", frozenset(expensive))
+        object.__setattr__(self, "deferred", self.awaited | self.expensive)
+        targets = [(is_typecheck, target) for _, is_typecheck, target, _ in keyword.values() if target is not None]
+        object.__setattr__(
+            self, "type_only", all(is_typecheck and _is_type_based(target) for is_typecheck, target in targets)
+        )
+        object.__setattr__(
+            self,
+            "abc_checks",
+            sum(1 for is_typecheck, target in targets if is_typecheck and _is_abc_check(target)),
+        )
+
+    def substitute(self, args: tuple, kwargs: Dict[str, Any]) -> Tuple[tuple, Dict[str, Any]]:
+        """replace the validated arguments by the result of the substitute function of their validator"""
+        for index, name, substitute in self.substitutions:
+            if self.var_positional is not None and name == self.var_positional.name:
+                args = args[:index] + tuple(map(substitute, args[index:]))
+            elif self.var_keyword is not None and name == self.var_keyword.name:
+                for key in [key for key in kwargs if key not in self.by_keyword]:
+                    kwargs[key] = substitute(kwargs[key])
+            elif index is not None and index < len(args):
+                args = args[:index] + (substitute(args[index]),) + args[index + 1 :]
+            elif name in kwargs:
+                kwargs[name] = substitute(kwargs[name])
+        return args, kwargs
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+def _classes(classinfo: Any) -> Tuple[Any, ...]:
+    return classinfo if isinstance(classinfo, tuple) else (classinfo,)
+
+
+def _is_type_based(classinfo: Any) -> bool:
+    """whether isinstance(arg, classinfo) depends on type(arg) only
+
+    This holds for plain classes and ABCs, but not for e.g. runtime checkable protocols,
+    which look at the attributes of the instance.
+    """
+    return all(type(cls) in (type, ABCMeta) for cls in _classes(classinfo))
+
+
+def _is_abc_check(classinfo: Any) -> bool:
+    return any(type(cls) is ABCMeta for cls in _classes(classinfo))
+
+
+def _is_async(is_typecheck: bool, target: Any) -> bool:
+    if is_typecheck or target is None:
+        return False
+    return inspect.iscoroutinefunction(target) or inspect.iscoroutinefunction(getattr(target, "__call__", None))
+
+
+def _is_expensive(is_typecheck: bool, target: Any) -> bool:
+    return not is_typecheck and getattr(target, "expensive", False) is True and not _is_async(is_typecheck, target)
+
+
+def _resolve_annotations(obj: Any, annotations: Dict[str, Any]) -> Dict[str, Any]:
+    """``annotations`` of the function or class ``obj`` with string annotations (``from __future__ import
+    annotations``) resolved"""
+    annotations = dict(annotations)
+    if any(isinstance(annotation, str) for annotation in annotations.values()):
+        try:
+            hints = typing.get_type_hints(obj)
+        except Exception:
+            hints = {}  # unresolvable forward references stay unchecked
+        annotations.update((name, hints[name]) for name in annotations if name in hints)
+    return annotations
+
+
+def _make_check(name: str, annotation: Annotation, depth: int, sample: Optional[int]) -> Check:
+    checker = annotation.checker(depth, sample)
+    if checker is None:
+        return name, False, None, annotation.annotation
+    type_of_check, target = checker
+    return name, type_of_check == Validator.TYPECHECK, target, annotation.annotation
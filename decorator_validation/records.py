@@ -0,0 +1,261 @@
+"""validated record classes, a ``__slots__`` class with a generated ``__init__`` checking its fields inline
+
+Compared to ``check_types`` on the ``__init__`` of a plain class there is no wrapper frame, no per call
+signature work and no ``__dict__`` per instance.
+"""
+import itertools
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from . import config as _config
+from .config import ALWAYS, OFF, parse_mode
+from .decorators import _is_override, _raise_type_error
+from .typing_checks import DEFAULT_DEPTH, DEFAULT_SAMPLE
+
+# keywords that configure validated_record itself, with their defaults
+_OPTIONS = {
+    "validate_assignment": False,
+    "mode": None,
+    "depth": DEFAULT_DEPTH,
+    "sample": DEFAULT_SAMPLE,
+}
+
+# class attributes that are not copied into the generated class
+_EXCLUDED = ("__dict__", "__weakref__")
+
+
+def validated_record(cls: Optional[type] = None, **kwargs) -> Any:
+    """Class decorator turning the annotated class attributes into validated fields
+
+    The generated class has ``__slots__`` for the fields and an ``__init__`` taking them in order of their
+    annotations, class attribute values are defaults (not validated, like defaults of ``check_types``).
+    ``__repr__`` and ``__eq__`` are generated unless the class defines them. The class can't define ``__init__``,
+    a ``__post_init__(self)`` method is called at the end of the generated one instead.
+
+    Besides override kwargs per field (types, tuples or validators, e.g. the ``std_validators``)
+    the following options are accepted:
+
+    - ``validate_assignment``: check fields on assignment as well (default False)
+    - ``mode``: validation mode of the record, see ``check_types`` (default None)
+    - ``depth``, ``sample``: checks of typing annotations, see ``check_types``
+
+    Fields of record base classes come first and keep their checks. Subclasses of records validating
+    assignments validate assignments of their own fields as well.
+
+    Example
+    -------
+    >>> @validated_record(path=std_validators.is_file)
+    ... class Input:
+    ...     path: str
+    ...     count: int = 1
+    """
+    options = dict(_OPTIONS)
+    for name in _OPTIONS:
+        if name in kwargs and not _is_override(kwargs[name]):
+            options[name] = kwargs.pop(name)
+
+    def decorator(cls: type) -> type:
+        return _make_record(cls, kwargs, **options)
+
+    if cls is not None:
+        return decorator(cls)
+    return decorator
+
+
+def _annotations(cls: type) -> Dict[str, Any]:
+    """own annotations of the class, string annotations are resolved"""
+    from .plan import _resolve_annotations
+
+    annotations = _resolve_annotations(cls, cls.__dict__.get("__annotations__", {}))
+    return {name: annotation for name, annotation in annotations.items() if not _is_class_var(annotation)}
+
+
+def _is_class_var(annotation: Any) -> bool:
+    return annotation is typing.ClassVar or typing.get_origin(annotation) is typing.ClassVar
+
+
+def _make_record(
+    cls: type, override_kwargs: Dict[str, Any], validate_assignment: bool, mode: Any, depth: int, sample: Optional[int]
+) -> type:
+    from .codegen import MISSING, _PREFIX
+    from .helpers import Annotation
+    from .plan import Check, _is_async, _make_check
+
+    if "__init__" in cls.__dict__:
+        raise TypeError(f"{cls.__qualname__} defines __init__, which is generated, use __post_init__ instead")
+    own_mode = None if mode is None else parse_mode(mode)
+    # the generated __setattr__ of a record base only knows the fields of that base
+    validate_assignment = validate_assignment or getattr(cls.__setattr__, "__validates_record__", False)
+    checks: Dict[str, Check] = {}
+    defaults: Dict[str, Any] = {}
+    for base in reversed(cls.__mro__[1:]):
+        checks.update(getattr(base, "__record_checks__", {}))
+        defaults.update(getattr(base, "__record_defaults__", {}))
+
+    annotations = _annotations(cls)
+    # fields redeclared by a subclass already have a slot
+    own_fields = [name for name in annotations if name not in checks]
+    for name, annotation in annotations.items():
+        if name.startswith(_PREFIX):
+            raise TypeError(f"Field {name} of {cls.__qualname__} starts with {_PREFIX}, which is reserved")
+        if name in override_kwargs:
+            annotation = Annotation(override_kwargs[name], Annotation.OVERRIDE)
+        else:
+            annotation = Annotation(annotation, Annotation.SIGNATURE)
+        check = _make_check(name, annotation, depth, sample)
+        if _is_async(check[1], check[2]):
+            raise TypeError(f"Async validator for field {name} of {cls.__qualname__} is not supported")
+        checks[name] = check
+        default = cls.__dict__.get(name, MISSING)
+        if isinstance(default, (list, dict, set)):
+            raise ValueError(f"Mutable default {type(default)} for field {name} is not allowed, use None")
+        if default is not MISSING:
+            defaults[name] = default
+        else:
+            defaults.pop(name, None)
+
+    fields = tuple(checks)
+    first_default = next((name for name in fields if name in defaults), None)
+    for name in fields[fields.index(first_default) + 1 :] if first_default is not None else ():
+        if name not in defaults:
+            raise TypeError(f"Field {name} without default follows field {first_default} with default")
+
+    namespace = {name: value for name, value in cls.__dict__.items() if name not in _EXCLUDED}
+    for name in annotations:
+        namespace.pop(name, None)  # defaults would shadow the slots
+    namespace["__qualname__"] = cls.__qualname__
+    namespace["__slots__"] = tuple(own_fields)
+    namespace["__record_checks__"] = checks
+    namespace["__record_defaults__"] = defaults
+    namespace["__match_args__"] = fields
+
+    def fail(name, arg):
+        _raise_type_error(name, arg, checks[name][3])
+
+    post_init = hasattr(cls, "__post_init__")
+    namespace["__init__"] = _compile_init(cls, fields, checks, defaults, fail, own_mode, validate_assignment, post_init)
+    if validate_assignment and "__setattr__" not in namespace:
+        namespace["__setattr__"] = _make_setattr(checks, fail, own_mode)
+    if "__repr__" not in namespace:
+        namespace["__repr__"] = _make_repr(fields)
+    if "__eq__" not in namespace:
+        namespace["__eq__"] = _make_eq(fields)
+
+    record = type(cls)(cls.__name__, cls.__bases__, namespace)
+    record.__init__.__qualname__ = f"{record.__qualname__}.__init__"
+    for member in namespace.values():
+        _repoint_class_cell(member, cls, record)
+    return record
+
+
+def _repoint_class_cell(member: Any, cls: type, record: type):
+    """point the ``__class__`` cell of a copied method (used by zero argument ``super()``) to the record"""
+    if isinstance(member, (classmethod, staticmethod)):
+        functions = [member.__func__]
+    elif isinstance(member, property):
+        functions = [member.fget, member.fset, member.fdel]
+    else:
+        functions = [member]
+    for function in functions:
+        closure = getattr(function, "__closure__", None)
+        if not closure:
+            continue
+        for name, cell in zip(function.__code__.co_freevars, closure):
+            if name == "__class__" and cell.cell_contents is cls:
+                cell.cell_contents = record
+
+
+def _compile_init(
+    cls: type,
+    fields: Tuple[str, ...],
+    checks: Dict[str, Any],
+    defaults: Dict[str, Any],
+    fail: Callable[[str, Any], None],
+    mode: Any,
+    validate_assignment: bool,
+    post_init: bool,
+) -> Callable:
+    """generate ``__init__(self, *fields)`` with straight-line checks, see ``codegen.compile_wrapper``"""
+    from .codegen import MISSING, _PREFIX, _builtins, _check_lines, _exec, _gate, _indent
+
+    namespace: Dict[str, Any] = {
+        f"{_PREFIX}fail": fail,
+        f"{_PREFIX}missing": MISSING,
+        f"{_PREFIX}config": _config,
+        f"{_PREFIX}mode": mode,
+        f"{_PREFIX}always": ALWAYS,
+        f"{_PREFIX}off": OFF,
+        f"{_PREFIX}counter": itertools.count(),
+        f"{_PREFIX}setattr": object.__setattr__,
+        **_builtins(),
+    }
+    header: List[str] = ["self"]
+    bound: List[str] = []
+    fill: List[str] = []
+    body: List[str] = []
+    for name in fields:
+        checked = _check_lines(checks[name], namespace, bound)
+        if name not in defaults:
+            header.append(name)
+            body.extend(_indent(line, 1) for line in checked)
+        else:
+            default_name = f"{_PREFIX}default_{name}"
+            namespace[default_name] = defaults[name]
+            header.append(f"{name}={_PREFIX}missing")
+            fill_default = f"if {name} is {_PREFIX}missing:\n    {name} = {default_name}"
+            body.append(_indent(fill_default, 1))
+            fill.append(_indent(fill_default, 2))
+            if checked:
+                body.append(_indent("else:", 1))
+                body.extend(_indent(line, 2) for line in checked)
+    if validate_assignment:
+        bound.append(f"{_PREFIX}setattr={_PREFIX}setattr")
+    if bound:
+        header.append("*")
+        header.extend(bound)
+
+    # with validation on assignment the checks already ran, so the fields are set bypassing __setattr__
+    assign = (
+        [f"    {_PREFIX}setattr(self, {name!r}, {name})" for name in fields]
+        if validate_assignment
+        else [f"    self.{name} = {name}" for name in fields]
+    )
+    if post_init:
+        assign.append("    self.__post_init__()")
+    gate = [_indent(_gate(f"{_PREFIX}mode"), 1), *fill, *_indent("\n".join(assign), 1).splitlines(), "        return"]
+    source = "\n".join(["def __init__(" + ", ".join(header) + "):", *gate, *body, *assign, "    return"])
+    return _exec(source, "__init__", f"{cls.__qualname__}.__init__", namespace)
+
+
+def _make_setattr(checks: Dict[str, Any], fail: Callable[[str, Any], None], own_mode: Any) -> Callable:
+    counter = itertools.count()
+
+    def __setattr__(self, name, value):
+        check = checks.get(name)
+        mode = own_mode or _config._mode
+        if check is not None and (
+            mode is ALWAYS or (mode is not OFF and next(counter) * mode.share % mode.period < mode.share)
+        ):
+            _, is_typecheck, target, _ = check
+            if target is not None and not (isinstance(value, target) if is_typecheck else target(value)):
+                fail(name, value)
+        object.__setattr__(self, name, value)
+
+    __setattr__.__validates_record__ = True
+    return __setattr__
+
+
+def _make_repr(fields: Tuple[str, ...]) -> Callable:
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in fields)
+        return f"{type(self).__qualname__}({values})"
+
+    return __repr__
+
+
+def _make_eq(fields: Tuple[str, ...]) -> Callable:
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in fields)
+
+    return __eq__
@@ -0,0 +1,290 @@
+"""validation of nested dicts and lists (e.g. parsed JSON) against a spec compiled once
+
+A spec is made of dicts (mappings with these keys), one element lists (lists of such elements),
+classes, tuples of classes, typing annotations and validators (returning a bool or raising,
+e.g. made with ``make_validator``). Keys wrapped in ``optional`` may be missing.
+
+The spec is compiled into a tree of nodes. A call walks the payload with bare checks and stops at the
+first failure, only then the payload is walked again to find the paths of the failures.
+"""
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from .typing_checks import is_typing_construct, translate
+from .types import SkipTypeCheck
+
+# failures shown in the message of the raised TypeError
+SHOWN_FAILURES = 10
+
+_MISSING = object()
+
+
+class optional:
+    """marks a key of a dict spec that may be missing: ``{optional("note"): str}``"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Hashable):
+        self.key = key
+
+    def __hash__(self):
+        return hash((optional, self.key))
+
+    def __eq__(self, other):
+        return isinstance(other, optional) and other.key == self.key
+
+    def __repr__(self):
+        return f"optional({self.key!r})"
+
+
+class _Node(ABC):
+    """compiled part of a spec, ``check(value)`` decides fast, ``explain`` adds the failures below ``path``
+    to ``errors``, it is only called for values that failed"""
+
+    __slots__ = ("check",)
+
+    check: Callable[[Any], bool]
+
+    @abstractmethod
+    def explain(self, value: Any, path: str, errors: List[str], limit: Optional[int]):
+        pass
+
+
+class _Leaf(_Node):
+    __slots__ = ("is_typecheck", "target", "required")
+
+    def __init__(self, is_typecheck: bool, target: Any, required: Any):
+        self.is_typecheck = is_typecheck
+        self.target = target
+        self.required = required
+        if is_typecheck:
+            self.check = lambda value: isinstance(value, target)
+        else:
+
+            def check(value: Any) -> bool:
+                try:
+                    return bool(target(value))
+                except Exception:
+                    return False
+
+            self.check = check
+
+    def explain(self, value: Any, path: str, errors: List[str], limit: Optional[int]):
+        if self.is_typecheck:
+            if not isinstance(value, self.target):
+                errors.append(f"{path}: required {self.required} but got {type(value)}")
+            return
+        try:
+            valid = self.target(value)
+        except Exception as error:
+            errors.append(f"{path}: {type(error).__name__}: {error}")
+            return
+        if not valid:
+            if self.required is self.target:  # a validator of the spec, not a translated annotation
+                errors.append(f"{path}: {type(value)} rejected by {getattr(self.target, '__name__', self.target)}")
+            else:
+                errors.append(f"{path}: required {self.required} but got {type(value)}")
+
+
+class _Dict(_Node):
+    __slots__ = ("fields", "strict", "max_keys")
+
+    def __init__(self, fields: List[Tuple[Hashable, _Node, bool]], strict: bool, max_keys: Optional[int]):
+        self.fields = fields  # (key, node, required)
+        self.strict = strict
+        self.max_keys = max_keys
+        self.check = self._compile_check()
+
+    def _compile_check(self) -> Callable[[Any], bool]:
+        """generate straight-line code checking the fields, ``isinstance`` checks of the values are inlined"""
+        from .codegen import _PREFIX, _exec, _indent
+
+        namespace: Dict[str, Any] = {f"{_PREFIX}mapping": Mapping, f"{_PREFIX}missing": _MISSING}
+        lines = [
+            f"if type(value) is not dict and not isinstance(value, {_PREFIX}mapping):",
+            "    return False",
+        ]
+        if self.max_keys is not None:
+            lines += [f"if len(value) > {self.max_keys}:", "    return False"]
+        for i, (key, node, required) in enumerate(self.fields):
+            namespace[f"{_PREFIX}key_{i}"] = key
+            lines.append(f"v = value.get({_PREFIX}key_{i}, {_PREFIX}missing)")
+            missing = "return False" if required else "pass"
+            lines += [f"if v is {_PREFIX}missing:", f"    {missing}"]
+            if isinstance(node, _Anything):
+                continue
+            if isinstance(node, _Leaf) and node.is_typecheck:
+                namespace[f"{_PREFIX}type_{i}"] = node.target
+                test = f"isinstance(v, {_PREFIX}type_{i})"
+            else:
+                namespace[f"{_PREFIX}check_{i}"] = node.check
+                test = f"{_PREFIX}check_{i}(v)"
+            lines += [f"elif not {test}:", "    return False"]
+        if self.strict:
+            namespace[f"{_PREFIX}known"] = frozenset(key for key, *_ in self.fields)
+            lines += [f"if not {_PREFIX}known.issuperset(value):", "    return False"]
+        lines.append("return True")
+        source = "def check(value):\n" + _indent("\n".join(lines), 1)
+        return _exec(source, "check", "schema", namespace)
+
+    def explain(self, value: Any, path: str, errors: List[str], limit: Optional[int]):
+        if not isinstance(value, Mapping):
+            errors.append(f"{path}: required a mapping but got {type(value)}")
+            return
+        if self.max_keys is not None and len(value) > self.max_keys:
+            errors.append(f"{path}: {len(value)} keys, at most {self.max_keys} are allowed")
+            return
+        for key, node, required in self.fields:
+            if limit is not None and len(errors) >= limit:
+                return
+            if key in value:
+                if not node.check(value[key]):
+                    node.explain(value[key], f"{path}[{key!r}]", errors, limit)
+            elif required:
+                errors.append(f"{path}: missing key {key!r}")
+        if self.strict:
+            known = {key for key, *_ in self.fields}
+            unexpected = [key for key in value if key not in known]
+            if unexpected:
+                errors.append(f"{path}: unexpected keys {unexpected}")
+
+
+class _List(_Node):
+    __slots__ = ("element", "sample", "by_type")
+
+    def __init__(self, element: _Node, sample: Optional[int]):
+        from .plan import _is_type_based
+
+        self.element = element
+        self.sample = sample
+        # elements checked against plain classes are decided once per distinct type
+        self.by_type = isinstance(element, _Leaf) and element.is_typecheck and _is_type_based(element.target)
+        self.check = self._check
+
+    def _checked(self, value: list) -> Tuple[list, int]:
+        if self.sample is None or len(value) <= self.sample:
+            return value, 1
+        step = len(value) // self.sample
+        return value[::step], step
+
+    def _check(self, value: Any) -> bool:
+        if not isinstance(value, (list, tuple)):
+            return False
+        checked, _ = self._checked(value)
+        if self.by_type:
+            target = self.element.target
+            return all(issubclass(value_type, target) for value_type in set(map(type, checked)))
+        check = self.element.check
+        for element in checked:
+            if not check(element):
+                return False
+        return True
+
+    def explain(self, value: Any, path: str, errors: List[str], limit: Optional[int]):
+        if not isinstance(value, (list, tuple)):
+            errors.append(f"{path}: required a list but got {type(value)}")
+            return
+        checked, step = self._checked(value)
+        check = self.element.check
+        for i, element in enumerate(checked):
+            if limit is not None and len(errors) >= limit:
+                return
+            if not check(element):
+                self.element.explain(element, f"{path}[{i * step}]", errors, limit)
+
+
+class _Anything(_Node):
+    __slots__ = ()
+
+    def __init__(self):
+        self.check = lambda value: True
+
+    def explain(self, value: Any, path: str, errors: List[str], limit: Optional[int]):
+        pass
+
+
+def _compile(spec: Any, depth: Optional[int], max_keys: Optional[int], sample: Optional[int], strict: bool) -> _Node:
+    node = getattr(spec, "schema_node", None)
+    if node is not None:  # a compiled schema used inside another spec keeps its own limits
+        return node
+    if isinstance(spec, dict):
+        if depth is not None and depth <= 0:
+            return _Leaf(True, Mapping, Mapping)
+        fields = []
+        for key, value_spec in spec.items():
+            node = _compile(value_spec, _deeper(depth), max_keys, sample, strict)
+            fields.append((key.key, node, False) if isinstance(key, optional) else (key, node, True))
+        return _Dict(fields, strict, max_keys)
+    if isinstance(spec, list):
+        if len(spec) != 1:
+            raise ValueError(f"A list spec has to hold exactly one element spec but holds {len(spec)}")
+        if depth is not None and depth <= 0:
+            return _Leaf(True, (list, tuple), list)
+        return _List(_compile(spec[0], _deeper(depth), max_keys, sample, strict), sample)
+    if spec is SkipTypeCheck:
+        return _Anything()
+    if isinstance(spec, str):
+        raise TypeError(f"Unsupported spec {spec!r}, strings would be forward references")
+    if isinstance(spec, (type, tuple)) or not callable(spec) or is_typing_construct(spec):
+        translation = translate(spec)
+        if translation is None:
+            return _Anything()
+        return _Leaf(translation[0], translation[1], spec)
+    return _Leaf(False, spec, spec)
+
+
+def _deeper(depth: Optional[int]) -> Optional[int]:
+    return None if depth is None else depth - 1
+
+
+def schema(
+    spec: Any,
+    collect: bool = False,
+    depth: Optional[int] = None,
+    max_keys: Optional[int] = None,
+    sample: Optional[int] = None,
+    strict: bool = False,
+) -> Callable[[Any], bool]:
+    """compile ``spec`` into a validator of nested payloads, usable as ``check_types`` override
+
+    The validator returns True or raises a TypeError naming the failing paths (like ``$['items'][3]['id']``).
+    ``validator.errors(payload)`` returns the failures without raising.
+
+    Parameters
+    ----------
+    spec : Any
+        dicts, one element lists, classes, tuples of classes, typing annotations and validators
+    collect : bool
+        report all failures instead of the first one, by default False
+    depth : Optional[int]
+        how many nested dicts / lists have their contents checked, deeper ones only get an ``isinstance`` check,
+        None checks the whole spec, by default None
+    max_keys : Optional[int]
+        mappings with more keys fail, by default None
+    sample : Optional[int]
+        check only about this many evenly spread elements of each list, None checks all, by default None
+    strict : bool
+        mappings must not have keys that are not in the spec, by default False
+    """
+    root = _compile(spec, depth, max_keys, sample, strict)
+    limit = None if collect else 1
+
+    def errors(payload: Any) -> List[str]:
+        """the failures of ``payload``, all of them if ``collect`` else the first one"""
+        if root.check(payload):
+            return []
+        found: List[str] = []
+        root.explain(payload, "$", found, limit)
+        return found
+
+    def check_fn(payload: Any) -> bool:
+        if root.check(payload):
+            return True
+        found = errors(payload) or ["$: rejected"]  # a validator that changed its mind
+        shown = "; ".join(found[:SHOWN_FAILURES])
+        more = f"; ... ({len(found)} failures)" if len(found) > SHOWN_FAILURES else ""
+        raise TypeError(f"Payload does not match the schema: {shown}{more}")
+
+    check_fn.errors = errors
+    check_fn.schema_node = root
+    return check_fn
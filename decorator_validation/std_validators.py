@@ -1,6 +1,38 @@
-from typing import Union, Tuple, Iterable, Sequence
+import csv
+import math
+import os
+import re
+import sys
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Union, Tuple, Iterable, Iterator, Sequence, Optional, Dict, List, Callable
 from pathlib import Path
-from .decorators import make_validator
+from stat import S_ISREG
+from .decorators import make_validator, cached_validator
+
+if TYPE_CHECKING:
+    import numpy
+
+# python type of the elements of buffers by struct / array format character
+_BUFFER_ELEMENT_TYPES = {
+    **{code: int for code in "bBhHiIlLqQnNP"},
+    **{code: float for code in "efd"},
+    "?": bool,
+    "c": bytes,
+    "u": str,
+    "w": str,
+}
+
+# strategies to select the elements checked when sampling
+SAMPLING_STRATEGIES = ("first", "stride", "random")
+
+# numpy scalar types matching the python types, as numpy does not subclass int and float for all of them
+_NUMPY_EQUIVALENTS = {int: "integer", float: "floating", complex: "complexfloating", bool: "bool_"}
 
 
 @make_validator
@@ -10,39 +42,601 @@ def is_file(file: Union[str, Path]) -> None:
         raise TypeError(f"File {str(file)} does not exist!")
 
 
-def is_iterable_of(type_: Union[type, Tuple[type]]):
+# is_file that skips the syscalls for paths that were found in the last minute.
+# Relative paths are cached as given, so do not change the working directory while using it.
+is_file_cached = cached_validator(maxsize=4096, ttl=60)(is_file)
+
+# set after is_file_cached was made, all_of would merge it and bypass the cache otherwise
+is_file.file_check = lambda path, stat, read: None  # check_file already requires a regular file
+
+
+# (path, stat of the path, read(offset, size) of at most size bytes, negative offsets count from the end of the file)
+# raises for invalid files
+FileCheck = Callable[[str, os.stat_result, Callable[[int, int], bytes]], None]
+
+# longest CSV header csv_header_is reads by default
+MAX_HEADER_SIZE = 64 * 1024
+
+
+def check_file(file: Union[str, Path], checks: Sequence[FileCheck]):
+    """stat ``file`` once and run the content ``checks`` on it, the file is opened at most once and only
+    if a check reads from it
+
+    The path is used as given (not resolved), like ``is_file`` symbolic links are followed.
+    """
+    path = os.fspath(file)
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        stat = None
+    if stat is None or not S_ISREG(stat.st_mode):
+        raise TypeError(f"File {path} does not exist!")
+    handle = None
+
+    def read(offset: int, size: int) -> bytes:
+        nonlocal handle
+        start = offset if offset >= 0 else stat.st_size + offset
+        if start < 0 or size <= 0:
+            return b""
+        if handle is None:
+            handle = open(path, "rb", buffering=0)
+        handle.seek(start)
+        return handle.read(size)
+
+    try:
+        for check in checks:
+            check(path, stat, read)
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def _file_validator(check: FileCheck) -> Callable[[Union[str, Path]], bool]:
+    """validator of a path running one content check, ``all_of`` merges the checks of several such validators
+    (and ``is_file``) so the file is only stat-ed and opened once"""
+
     @make_validator
-    def check_fn(arg: Iterable):
-        if not isinstance(arg, Iterable):
-            raise TypeError("Argument has to be an iterable!")
+    def check_fn(file: Union[str, Path]):
+        check_file(file, (check,))
+
+    check_fn.file_check = check
+    return check_fn
+
+
+def has_magic(magic: bytes, offset: int = 0):
+    """validator checking that a file holds the bytes ``magic`` at ``offset``, only these bytes are read
+
+    Negative offsets count from the end of the file, e.g. Parquet files start and end with ``b"PAR1"``:
+    ``all_of(has_magic(b"PAR1"), has_magic(b"PAR1", offset=-4))``.
+    """
+    if not magic:
+        raise ValueError("magic has to be at least one byte")
+
+    def check(path: str, stat: os.stat_result, read: Callable[[int, int], bytes]):
+        found = read(offset, len(magic))
+        if found != magic:
+            raise TypeError(f"File {path} has to hold {magic!r} at offset {offset} but holds {found!r}")
+
+    return _file_validator(check)
+
+
+def min_size(size: int):
+    """validator checking that a file has at least ``size`` bytes, from ``os.stat`` without opening the file"""
+
+    def check(path: str, stat: os.stat_result, read: Callable[[int, int], bytes]):
+        if stat.st_size < size:
+            raise TypeError(f"File {path} has to have at least {size} bytes but has {stat.st_size}")
+
+    return _file_validator(check)
+
+
+def csv_header_is(
+    columns: Sequence[str], delimiter: str = ",", encoding: str = "utf-8-sig", max_size: int = MAX_HEADER_SIZE
+):
+    """validator checking that the first line of a CSV file holds exactly ``columns``
+
+    Only the first line is read, at most ``max_size`` bytes. The line is parsed with ``csv`` (quotes are allowed),
+    a byte order mark is skipped with the default encoding.
+    """
+    expected = list(columns)
+
+    def check(path: str, stat: os.stat_result, read: Callable[[int, int], bytes]):
+        head = read(0, max_size)
+        end = head.find(b"\n")
+        if end < 0 and len(head) == max_size:
+            raise TypeError(f"File {path} has no header line within the first {max_size} bytes")
+        line = head if end < 0 else head[:end]
+        try:
+            header = next(csv.reader([line.decode(encoding).rstrip("\r")], delimiter=delimiter), [])
+        except (UnicodeDecodeError, csv.Error) as error:
+            raise TypeError(f"File {path} has no valid CSV header: {error}") from None
+        if header != expected:
+            raise TypeError(f"File {path} has to have the CSV header {expected} but has {header}")
+
+    return _file_validator(check)
+
+
+def _answer_from_listing(directory: str, names: Dict[str, List[int]], kind: str, found: List[Optional[bool]]):
+    """answer the existence of many entries of one directory from a single listing
+
+    Entries missing in the listing stay undecided (e.g. on case insensitive file systems) and are stat-ed later.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                indices = names.get(entry.name)
+                if indices is not None:
+                    exists = entry.is_file() if kind == "file" else entry.is_dir()
+                    for i in indices:
+                        found[i] = exists
+    except (FileNotFoundError, NotADirectoryError):
+        for indices in names.values():
+            for i in indices:
+                found[i] = False
+    except OSError:
+        pass  # e.g. no permission to list, stat the entries one by one
+
+
+def batch_path_validator(kind: str = "file", max_workers: int = 8, min_scan: int = 4) -> Callable[[Iterable], bool]:
+    """validator checking that all paths of an iterable exist, with one listing per directory
+
+    Paths are grouped by their directory. Directories holding at least ``min_scan`` of the paths are listed once
+    with ``os.scandir``, all other paths are stat-ed concurrently by a bounded thread pool.
+    The error lists all missing paths at once.
+
+    Parameters
+    ----------
+    kind : str
+        ``"file"`` or ``"dir"``, by default "file"
+    max_workers : int
+        maximal number of threads stat-ing paths, by default 8
+    min_scan : int
+        minimal number of paths in one directory to list it instead of stat-ing them, by default 4
+    """
+    if kind not in ("file", "dir"):
+        raise ValueError(f"kind has to be 'file' or 'dir' but is {kind!r}")
+    stat = os.path.isfile if kind == "file" else os.path.isdir
+    executor: Optional[ThreadPoolExecutor] = None
+    executor_lock = threading.Lock()
+
+    def get_executor() -> ThreadPoolExecutor:
+        nonlocal executor
+        with executor_lock:
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="are_files")
+            return executor
+
+    @make_validator
+    def check_fn(paths: Iterable[Union[str, Path]]):
+        if isinstance(paths, (str, bytes)) or not isinstance(paths, Iterable):
+            raise TypeError("Argument has to be an iterable of paths!")
+        paths = [os.fsdecode(path) for path in paths]
+        found: List[Optional[bool]] = [None] * len(paths)
+
+        groups: Dict[str, Dict[str, List[int]]] = {}
+        for i, path in enumerate(paths):
+            directory, name = os.path.split(path)
+            if name:
+                groups.setdefault(directory or os.curdir, {}).setdefault(name, []).append(i)
+        for directory, names in groups.items():
+            if sum(len(indices) for indices in names.values()) >= min_scan:
+                _answer_from_listing(os.path.realpath(directory), names, kind, found)
+
+        remaining = [i for i, exists in enumerate(found) if exists is None]
+        if len(remaining) == 1:
+            found[remaining[0]] = stat(paths[remaining[0]])
+        elif remaining:
+            for i, exists in zip(remaining, get_executor().map(stat, [paths[i] for i in remaining])):
+                found[i] = exists
+
+        missing = [path for path, exists in zip(paths, found) if not exists]
+        if missing:
+            raise TypeError(f"{len(missing)} of {len(paths)} {kind}s do not exist: {', '.join(missing)}")
+
+    return check_fn
+
+
+# check that all paths of an iterable are existing files / directories
+are_files = batch_path_validator("file")
+are_dirs = batch_path_validator("dir")
+
+
+def _is_numpy_array(arg) -> bool:
+    # numpy is never imported here, if it is not loaded arg can not be an array
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(arg, numpy.ndarray)
+
+
+def _is_indexable(arg) -> bool:
+    # numpy arrays are no registered sequences but behave like one, array.array is registered from python 3.10 on
+    return isinstance(arg, Sequence) or _buffer_element_type(arg) is not None or _is_numpy_array(arg)
+
+
+def _buffer_element_type(arg) -> Optional[type]:
+    """python type of the elements of a 1-d buffer (array.array, bytes, bytearray, memoryview), if known"""
+    if isinstance(arg, (bytes, bytearray)):
+        return int
+    if isinstance(arg, array):
+        return _BUFFER_ELEMENT_TYPES.get(arg.typecode)
+    if isinstance(arg, memoryview) and arg.ndim == 1:
+        return _BUFFER_ELEMENT_TYPES.get(arg.format.lstrip("@=<>!"))
+    return None
+
+
+def _numpy_elements_match(arg, type_) -> Optional[bool]:
+    """decide from the dtype if all elements of a numpy array are of ``type_``, None if arg is no such array"""
+    if not _is_numpy_array(arg) or arg.ndim != 1 or arg.dtype.kind == "O":
+        return None
+    numpy = sys.modules["numpy"]
+    scalar_type = arg.dtype.type
+    if issubclass(scalar_type, type_):
+        return True
+    types = type_ if isinstance(type_, tuple) else (type_,)
+    return any(
+        issubclass(scalar_type, getattr(numpy, _NUMPY_EQUIVALENTS[t]))
+        for t in types
+        if t in _NUMPY_EQUIVALENTS
+    )
+
+
+def _elements_match_fast(arg, type_) -> Optional[bool]:
+    """decide in O(1) if all elements of ``arg`` are of ``type_`` from the buffer format or numpy dtype
+
+    Returns None if this is not possible and the elements have to be checked one by one.
+    """
+    element_type = _buffer_element_type(arg)
+    if element_type is not None:
+        return len(arg) == 0 or issubclass(element_type, type_)
+    matches = _numpy_elements_match(arg, type_)
+    if matches is not None:
+        return arg.size == 0 or matches
+    return None
+
+
+def _sample_indices(length: int, sample: int, strategy: str) -> Iterable[int]:
+    """indices of the ``sample`` elements out of ``length`` that are checked"""
+    if strategy == "first":
+        return range(sample)
+    if strategy == "stride":
+        return range(0, length, length // sample)[:sample]
+    return sorted(random.sample(range(length), sample))
+
+
+def _check_sampled(arg: Iterable, type_: Union[type, Tuple[type]], sample: int, strategy: str):
+    """check a sample of ``sample`` elements, the cost is independent of the size of arg"""
+    if _is_indexable(arg):
+        length = len(arg)
+        checked = ((i, arg[i]) for i in _sample_indices(length, sample, strategy))
+    else:
+        # plain iterables can not be indexed, so only their first elements are checked
+        length, strategy = "an unknown number of", "first"
+        checked = enumerate(islice(arg, sample))
+    for i, a in checked:
+        if not isinstance(a, type_):
+            raise TypeError(
+                f"Argument has to be a sequence with elements of type {type_}, "
+                + f"but the element at index {i} has type {type(a)} "
+                + f"(sampling was in effect: {strategy} {sample} of {length} elements were checked)"
+            )
+
+
+def _check_elements(
+    arg: Iterable, type_: Union[type, Tuple[type]], sample: Optional[int] = None, strategy: str = "random"
+):
+    matches = _elements_match_fast(arg, type_)
+    if matches is None and sample is not None and not (_is_indexable(arg) and len(arg) <= sample):
+        _check_sampled(arg, type_, sample, strategy)
+    elif matches is None:
         for a in arg:
             if not isinstance(a, type_):
                 raise TypeError(
                     f"Argument has to be a sequence with elements of type {type_},"
                     + f"but an element with type {type(a)} occured"
                 )
+    elif not matches:
+        element_type = _buffer_element_type(arg) or arg.dtype
+        raise TypeError(
+            f"Argument has to be a sequence with elements of type {type_},"
+            + f"but it holds elements of type {element_type}"
+        )
+
+
+def _check_sampling(sample: Optional[int], strategy: str):
+    if sample is not None and (not isinstance(sample, int) or sample < 1):
+        raise ValueError(f"sample has to be a positive int but is {sample!r}")
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f"strategy has to be one of {SAMPLING_STRATEGIES} but is {strategy!r}")
+
+
+def _validating_iterator(arg: Iterator, type_: Union[type, Tuple[type]]) -> Iterator:
+    """yield the elements of arg, raising at the first element that is not of type ``type_``"""
+    for i, a in enumerate(arg):
+        if not isinstance(a, type_):
+            raise TypeError(
+                f"Argument has to be an iterable with elements of type {type_}, "
+                + f"but the element at index {i} has type {type(a)}"
+            )
+        yield a
+
+
+def is_iterable_of(
+    type_: Union[type, Tuple[type]], sample: Optional[int] = None, strategy: str = "random", stream: bool = False
+):
+    """validator checking that all elements of an iterable are of type ``type_``
+
+    Buffers (``array.array``, ``bytes``, ``memoryview``) and numpy arrays are checked in O(1) by their format / dtype.
+
+    Parameters
+    ----------
+    type_ : Union[type, Tuple[type]]
+        required type of the elements
+    sample : Optional[int]
+        check only this many elements instead of all of them, by default None
+    strategy : str
+        how the sampled elements are selected: ``"first"`` elements, evenly spaced (``"stride"``) or ``"random"``.
+        Iterables that are no sequences are always checked with ``"first"``. By default "random"
+    stream : bool
+        do not consume iterators (e.g. generators) but let ``check_types`` pass a wrapper to the function
+        that validates each element when it is consumed, by default False
+    """
+    _check_sampling(sample, strategy)
+
+    @make_validator
+    def check_fn(arg: Iterable):
+        if not isinstance(arg, Iterable):
+            raise TypeError("Argument has to be an iterable!")
+        # iterators are validated lazily by the substitute
+        if not (stream and isinstance(arg, Iterator)):
+            _check_elements(arg, type_, sample, strategy)
+
+    if stream:
+
+        def substitute(arg: Iterable) -> Iterable:
+            return _validating_iterator(arg, type_) if isinstance(arg, Iterator) else arg
+
+        check_fn.substitute = substitute
 
     return check_fn
 
 
-def is_sequence_of(type_: Union[type, Tuple[type]]):
+def is_sequence_of(type_: Union[type, Tuple[type]], sample: Optional[int] = None, strategy: str = "random"):
+    """validator checking that all elements of a sequence are of type ``type_``
+
+    Buffers (``array.array``, ``bytes``, ``memoryview``) and numpy arrays are checked in O(1) by their format / dtype.
+
+    Parameters
+    ----------
+    type_ : Union[type, Tuple[type]]
+        required type of the elements
+    sample : Optional[int]
+        check only this many elements instead of all of them, by default None
+    strategy : str
+        how the sampled elements are selected: ``"first"`` elements, evenly spaced (``"stride"``) or ``"random"``,
+        by default "random"
+    """
+    _check_sampling(sample, strategy)
+
     @make_validator
     def check_fn(arg: Sequence):
-        if not isinstance(arg, Sequence):
+        if not _is_indexable(arg):
             raise TypeError("Argument has to be an iterable!")
-        for a in arg:
-            if not isinstance(a, type_):
-                raise TypeError(
-                    f"Argument has to be a sequence with elements of type {type_},"
-                    + f"but an element with type {type(a)} occured"
-                )
+        _check_elements(arg, type_, sample, strategy)
 
     return check_fn
 
 
-@make_validator
-def is_num_as_str(number: str):
-    """validator checking if argument is a number written as a string"""
+# the grammar float() accepts for strings: digits with single underscores between them, an optional fraction
+# and exponent or inf / infinity / nan, all surrounded by optional whitespace
+_DIGITS = r"\d+(?:_\d+)*"
+# the whitespace float() strips, unlike \s without the separators \x1c - \x1f
+_SPACE = r"[\t\n\x0b\x0c\r \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]"
+_NUM_AS_STR = re.compile(
+    rf"{_SPACE}*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?|(?i:inf(?:inity)?|nan))"
+    + rf"{_SPACE}*"
+)
+_match_num_as_str = _NUM_AS_STR.fullmatch
+
+
+def is_num_as_str(number: str) -> bool:
+    """validator checking if argument is a number written as a string (anything ``float`` accepts)
+
+    Invalid inputs return False instead of raising, so they cost as little as valid ones.
+    """
     if not isinstance(number, str):
-        raise TypeError(f"{number} is not of type str but of type {type(number)}")
-    float(number)  # fails if not possible
+        return False
+    # plain integers are the most common case and need no grammar
+    return number.isdecimal() or _match_num_as_str(number) is not None
+
+
+def _numpy_strings():
+    numpy = sys.modules["numpy"]
+    return getattr(numpy, "strings", numpy.char)  # numpy.strings since numpy 2.0
+
+
+def _nums_as_str_mask(values: Iterable) -> Union[List[bool], "numpy.ndarray"]:
+    """whether each of the values is a number written as a string, a numpy bool array for numpy arrays"""
+    if _is_numpy_array(values):
+        numpy = sys.modules["numpy"]
+        if values.dtype.kind != "U":
+            return numpy.fromiter(map(is_num_as_str, values.ravel().tolist()), dtype=bool, count=values.size)
+        mask = _numpy_strings().isdecimal(values).ravel()
+        undecided = numpy.flatnonzero(~mask)
+        if undecided.size:
+            mask[undecided] = [is_num_as_str(value) for value in values.ravel()[undecided].tolist()]
+        return mask
+    return list(map(is_num_as_str, values))
+
+
+def _all_parse_as_float(strings: List[str]) -> bool:
+    """parse all strings in a single pass of float, at most one exception is raised"""
+    try:
+        deque(map(float, strings), maxlen=0)
+    except ValueError:
+        return False
+    return True
+
+
+@make_validator
+def are_nums_as_str(values: Iterable[str]):
+    """validator checking that all values of a list, tuple or numpy string array are numbers written as strings
+
+    Lists are first parsed in a single pass of ``float``, numpy string arrays are checked with vectorized
+    string operations. Only if that fails the values are checked one by one to name the invalid ones.
+    """
+    if isinstance(values, (str, bytes)) or not isinstance(values, Iterable):
+        raise TypeError("Argument has to be an iterable of strings!")
+    if _is_numpy_array(values):
+        if values.dtype.kind == "U":
+            if _numpy_strings().isdecimal(values).all() or _all_parse_as_float(values.ravel().tolist()):
+                return
+    else:
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        if all(issubclass(value_type, str) for value_type in set(map(type, values))) and _all_parse_as_float(values):
+            return
+    mask = _nums_as_str_mask(values)
+    if _is_numpy_array(values):
+        invalid = sys.modules["numpy"].flatnonzero(~mask).tolist()
+        flat = values.ravel().tolist() if invalid else values
+    else:
+        invalid = [i for i, valid in enumerate(mask) if not valid]
+        flat = values
+    if invalid:
+        shown = ", ".join(f"{i}: {flat[i]!r}" for i in invalid[:10])
+        more = ", ..." if len(invalid) > 10 else ""
+        raise TypeError(f"{len(invalid)} of {len(mask)} values are no numbers as strings: {shown}{more}")
+
+
+# dtype kinds whose values are ordered, so that min / max are defined: bool, signed, unsigned, float
+_ORDERED_KINDS = "biuf"
+
+ArrayDType = Union[type, str, "numpy.dtype"]
+
+
+def _dtype_matcher(dtype: Union[ArrayDType, Tuple[ArrayDType, ...]]) -> Callable[["numpy.dtype"], bool]:
+    """O(1) check of the dtype of an array
+
+    Python types and numpy scalar types (also abstract ones like ``numpy.floating``) match all dtypes of their kind,
+    e.g. ``float`` matches float16 to float128. Strings and dtypes have to be equal to the dtype of the array.
+    """
+    numpy = sys.modules["numpy"]
+    classes: List[type] = []
+    exact: List["numpy.dtype"] = []
+    for d in dtype if isinstance(dtype, tuple) else (dtype,):
+        if d in _NUMPY_EQUIVALENTS:
+            classes.append(getattr(numpy, _NUMPY_EQUIVALENTS[d]))
+        elif isinstance(d, type):
+            classes.append(d if issubclass(d, numpy.generic) else numpy.dtype(d).type)
+        else:
+            exact.append(numpy.dtype(d))
+    scalar_types = tuple(classes)
+
+    def matches(arg_dtype: "numpy.dtype") -> bool:
+        return issubclass(arg_dtype.type, scalar_types) or arg_dtype in exact
+
+    return matches
+
+
+def _shape_matcher(required: Tuple[Optional[int], ...]) -> Callable[[Tuple[int, ...]], bool]:
+    """O(1) check of the shape of an array, None entries of ``required`` match any size"""
+    ndim = len(required)
+    fixed = [i for i, size in enumerate(required) if size is not None]
+    if not fixed:
+        return lambda shape: len(shape) == ndim
+    if len(fixed) == ndim:
+        required = tuple(required)
+        return lambda shape: shape == required
+    sizes = itemgetter(*fixed)
+    expected = sizes(required)
+    return lambda shape: len(shape) == ndim and sizes(shape) == expected
+
+
+def _first_index(array_: "numpy.ndarray", mask: "numpy.ndarray") -> Tuple[int, ...]:
+    """index of the first True of ``mask`` in ``array_``, only used to report failures"""
+    numpy = sys.modules["numpy"]
+    return tuple(int(i) for i in numpy.unravel_index(int(numpy.argmax(mask)), array_.shape))
+
+
+def is_array(
+    dtype: Optional[Union[ArrayDType, Tuple[ArrayDType, ...]]] = None,
+    shape: Optional[Tuple[Optional[int], ...]] = None,
+    contiguous: Union[bool, str] = False,
+    finite: bool = False,
+    range: Optional[Tuple[Optional[float], Optional[float]]] = None,
+):
+    """validator checking a numpy array, its metadata and optionally its values
+
+    dtype, shape and memory layout are checked in O(1). The values are checked with ``min()`` and ``max()``,
+    vectorized reductions that do not copy the array (NaN propagates through them and infinite values are extremes),
+    only complex arrays need a temporary mask to check for finite values.
+
+    Parameters
+    ----------
+    dtype : Optional[Union[ArrayDType, Tuple[ArrayDType, ...]]]
+        python type (``float``), numpy scalar type (``numpy.float32``, ``numpy.floating``), dtype string (``"<f8"``)
+        or dtype, or a tuple of them, by default None
+    shape : Optional[Tuple[Optional[int], ...]]
+        required shape, None entries match any size (``(None, 3)``), by default None
+    contiguous : Union[bool, str]
+        True or ``"C"`` for C contiguous, ``"F"`` for Fortran contiguous arrays, by default False
+    finite : bool
+        no NaN or infinite values, by default False
+    range : Optional[Tuple[Optional[float], Optional[float]]]
+        inclusive bounds of the values, None for an open side, e.g. ``(0, None)``, by default None
+    """
+    if contiguous not in (False, True, "C", "F"):
+        raise ValueError(f"contiguous has to be a bool, 'C' or 'F' but is {contiguous!r}")
+    if range is not None and len(range) != 2:
+        raise ValueError(f"range has to be a tuple (low, high) but is {range!r}")
+    flag = {True: "C_CONTIGUOUS", "C": "C_CONTIGUOUS", "F": "F_CONTIGUOUS"}.get(contiguous)
+    shape_matches = _shape_matcher(shape) if shape is not None else None
+    low, high = range if range is not None else (None, None)
+    check_values = finite or low is not None or high is not None
+    dtype_matches = None
+
+    @make_validator
+    def check_fn(arg: "numpy.ndarray"):
+        nonlocal dtype_matches
+        if not _is_numpy_array(arg):
+            raise TypeError(f"Argument has to be a numpy array but is {type(arg)}")
+        if dtype is not None:
+            if dtype_matches is None:
+                dtype_matches = _dtype_matcher(dtype)  # numpy is loaded once there is an array
+            if not dtype_matches(arg.dtype):
+                raise TypeError(f"Array has to have dtype {dtype} but has dtype {arg.dtype}")
+        if shape_matches is not None and not shape_matches(arg.shape):
+            raise TypeError(f"Array has to have shape {shape} but has shape {arg.shape}")
+        if flag is not None and not arg.flags[flag]:
+            raise TypeError(f"Array has to be {flag.split('_')[0]} contiguous")
+        if check_values and arg.size:
+            _check_array_values(arg, finite, low, high)
+
+    return check_fn
+
+
+def _check_array_values(arg: "numpy.ndarray", finite: bool, low: Optional[float], high: Optional[float]):
+    numpy = sys.modules["numpy"]
+    kind = arg.dtype.kind
+    if kind == "c" and low is None and high is None:
+        if not numpy.isfinite(arg).all():
+            index = _first_index(arg, ~numpy.isfinite(arg))
+            raise TypeError(f"Array has to be finite but holds {arg[index]} at index {index}")
+        return
+    if kind not in _ORDERED_KINDS:
+        raise TypeError(f"Values of arrays with dtype {arg.dtype} can not be checked for finite values or a range")
+    # python scalars, comparing numpy scalars costs more than the reductions of small arrays
+    minimum, maximum = arg.min().item(), arg.max().item()
+    if finite and kind == "f" and not (math.isfinite(minimum) and math.isfinite(maximum)):
+        index = _first_index(arg, ~numpy.isfinite(arg))
+        raise TypeError(f"Array has to be finite but holds {arg[index]} at index {index}")
+    # NaN fails every comparison, so it is out of any range
+    if (low is not None and not minimum >= low) or (high is not None and not maximum <= high):
+        if kind == "f" and math.isnan(minimum):
+            outside = numpy.isnan(arg)
+        elif low is not None and minimum < low:
+            outside = arg < low
+        else:
+            outside = arg > high
+        index = _first_index(arg, outside)
+        raise TypeError(
+            f"Values of the array have to be in [{low}, {high}] but it holds {arg[index]} at index {index}"
+        )
@@ -0,0 +1,283 @@
+"""translation of typing annotations (Optional, Union, List[int], Dict[str, X], Literal, ...) into fast checks
+
+Each annotation is translated once into either a classinfo for a bare ``isinstance`` check or a composed predicate.
+Translations are memoized globally, so functions sharing common annotations share their checks.
+"""
+import collections
+import collections.abc
+import sys
+import typing
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# how many nested containers have their elements checked, deeper ones only get an isinstance check
+DEFAULT_DEPTH = 3
+# how many elements of a container are checked, None checks all of them
+DEFAULT_SAMPLE: Optional[int] = None
+
+# (is isinstance check, classinfo or predicate), None if every argument is valid
+Translation = Optional[Tuple[bool, Any]]
+
+NoneType = type(None)
+
+_cache: Dict[Tuple[Any, int, Optional[int]], Translation] = {}
+
+_UNION_TYPES: Tuple[Any, ...] = (typing.Union,)
+if sys.version_info >= (3, 10):
+    import types
+
+    _UNION_TYPES += (types.UnionType,)
+
+_ANNOTATED = getattr(typing, "Annotated", None)
+
+_SEQUENCES = (
+    list,
+    set,
+    frozenset,
+    collections.deque,
+    collections.abc.Sequence,
+    collections.abc.MutableSequence,
+    collections.abc.Set,
+    collections.abc.MutableSet,
+)
+_MAPPINGS = (
+    dict,
+    collections.defaultdict,
+    collections.OrderedDict,
+    collections.Counter,
+    collections.abc.Mapping,
+    collections.abc.MutableMapping,
+)
+
+
+def translate(annotation: Any, depth: int = DEFAULT_DEPTH, sample: Optional[int] = DEFAULT_SAMPLE) -> Translation:
+    """translate an annotation into a check, memoized by the annotation
+
+    Parameters
+    ----------
+    annotation : Any
+        class, tuple of classes or typing annotation
+    depth : int
+        how many nested containers have their elements checked, by default DEFAULT_DEPTH
+    sample : Optional[int]
+        how many elements of each container are checked, None checks all, by default DEFAULT_SAMPLE
+
+    Returns
+    -------
+    Translation
+        ``None`` if every argument is valid, ``(True, classinfo)`` for a bare ``isinstance`` check
+        or ``(False, predicate)`` for a composed check
+    """
+    key = (annotation, depth, sample)
+    try:
+        return _cache[key]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable annotation
+        return _translate(annotation, depth, sample)
+    translation = _cache[key] = _translate(annotation, depth, sample)
+    return translation
+
+
+def is_typing_construct(annotation: Any) -> bool:
+    """True for annotations that are no plain classes and can not be used with isinstance (e.g. List[int])"""
+    if isinstance(annotation, tuple):
+        return any(is_typing_construct(member) for member in annotation)
+    return (
+        typing.get_origin(annotation) is not None
+        or annotation in (typing.Any, typing.NoReturn)
+        or (type(annotation).__module__ == "typing" and not isinstance(annotation, type))
+    )
+
+
+def _translate(annotation: Any, depth: int, sample: Optional[int]) -> Translation:
+    if annotation is typing.Any or annotation is object or isinstance(annotation, (str, typing.ForwardRef)):
+        # unresolved forward references can not be checked
+        return None
+    if annotation is None or annotation is NoneType:
+        return True, NoneType
+    if isinstance(annotation, tuple):
+        return _union(annotation, depth, sample)
+    if isinstance(annotation, typing.TypeVar):
+        if annotation.__bound__ is not None:
+            return translate(annotation.__bound__, depth, sample)
+        if annotation.__constraints__:
+            return _union(annotation.__constraints__, depth, sample)
+        return None
+    if hasattr(annotation, "__supertype__"):  # NewType
+        return translate(annotation.__supertype__, depth, sample)
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is None:
+        # plain classes and everything unknown keep the plain isinstance check
+        return True, annotation
+    if _ANNOTATED is not None and origin is _ANNOTATED:
+        return translate(annotation.__origin__, depth, sample)
+    if origin in _UNION_TYPES:
+        return _union(args, depth, sample)
+    if origin is typing.Literal:
+        return False, _literal(args)
+    if origin is type:
+        return _subclass(args, depth, sample)
+    if not isinstance(origin, type):
+        return None
+    if origin is tuple and _is_empty_tuple(annotation, args):
+        return _tuple((), depth, sample)
+    if not args or depth <= 0:
+        return True, origin
+    if origin is tuple:
+        return _tuple(args, depth, sample)
+    if origin in _MAPPINGS and len(args) == 2:
+        return _mapping(origin, args, depth, sample)
+    if origin in _SEQUENCES or (origin is collections.Counter and len(args) == 1):
+        return _container(origin, args[0], depth, sample)
+    # elements of other generics (e.g. Iterable, Iterator, user defined ones) are not checked
+    # as iterating could consume them
+    return True, origin
+
+
+def _union(members: Iterable[Any], depth: int, sample: Optional[int]) -> Translation:
+    classinfos: List[Any] = []
+    predicates: List[Callable[[Any], bool]] = []
+    for member in members:
+        translation = translate(member, depth, sample)
+        if translation is None:
+            return None
+        is_typecheck, target = translation
+        if is_typecheck:
+            classinfos.extend(target if isinstance(target, tuple) else (target,))
+        else:
+            predicates.append(target)
+    classinfo = tuple(dict.fromkeys(classinfos))
+    if not predicates:
+        return True, classinfo[0] if len(classinfo) == 1 else classinfo
+
+    def check(arg) -> bool:
+        if isinstance(arg, classinfo):
+            return True
+        for predicate in predicates:
+            if predicate(arg):
+                return True
+        return False
+
+    return False, check
+
+
+def _literal(values: Tuple[Any, ...]) -> Callable[[Any], bool]:
+    # compare the type as well, as 1 == True
+    allowed = frozenset((type(value), value) for value in values)
+
+    def check(arg) -> bool:
+        try:
+            return (type(arg), arg) in allowed
+        except TypeError:  # unhashable argument
+            return False
+
+    return check
+
+
+def _subclass(args: Tuple[Any, ...], depth: int, sample: Optional[int]) -> Translation:
+    translation = translate(args[0], depth, sample) if args else None
+    if translation is None or not translation[0]:
+        return True, type
+    classinfo = translation[1]
+
+    def check(arg) -> bool:
+        return isinstance(arg, type) and issubclass(arg, classinfo)
+
+    return False, check
+
+
+def _elements(arg, sample: Optional[int]) -> Iterable:
+    """the elements of a container that are checked"""
+    if sample is None or len(arg) <= sample:
+        return arg
+    if isinstance(arg, collections.abc.Sequence):
+        return (arg[i] for i in range(0, len(arg), len(arg) // sample))
+    return islice(arg, sample)
+
+
+def _predicate(translation: Translation) -> Optional[Callable[[Any], bool]]:
+    if translation is None:
+        return None
+    is_typecheck, target = translation
+    if is_typecheck:
+        return lambda arg: isinstance(arg, target)
+    return target
+
+
+def _container(origin: type, element: Any, depth: int, sample: Optional[int]) -> Translation:
+    translation = translate(element, depth - 1, sample)
+    if translation is None:
+        return True, origin
+    is_typecheck, target = translation
+
+    if is_typecheck:
+
+        def check(arg) -> bool:
+            if not isinstance(arg, origin):
+                return False
+            for a in _elements(arg, sample):
+                if not isinstance(a, target):
+                    return False
+            return True
+
+    else:
+
+        def check(arg) -> bool:
+            if not isinstance(arg, origin):
+                return False
+            for a in _elements(arg, sample):
+                if not target(a):
+                    return False
+            return True
+
+    return False, check
+
+
+def _mapping(origin: type, args: Tuple[Any, Any], depth: int, sample: Optional[int]) -> Translation:
+    key_check = _predicate(translate(args[0], depth - 1, sample))
+    value_check = _predicate(translate(args[1], depth - 1, sample))
+    if key_check is None and value_check is None:
+        return True, origin
+    key_check = key_check or (lambda key: True)
+    value_check = value_check or (lambda value: True)
+
+    def check(arg) -> bool:
+        if not isinstance(arg, origin):
+            return False
+        items = arg.items() if sample is None or len(arg) <= sample else islice(arg.items(), sample)
+        for key, value in items:
+            if not (key_check(key) and value_check(value)):
+                return False
+        return True
+
+    return False, check
+
+
+def _is_empty_tuple(annotation: Any, args: Tuple[Any, ...]) -> bool:
+    """whether the annotation is ``Tuple[()]`` / ``tuple[()]``
+
+    Before python 3.11 ``Tuple[()]`` has the args ``((),)``, since then the args are empty as for the bare
+    ``Tuple``, which has no ``__args__`` (but empty ones on python 3.8)
+    """
+    if args == ((),):
+        return True
+    return not args and annotation is not typing.Tuple and getattr(annotation, "__args__", None) == ()
+
+
+def _tuple(args: Tuple[Any, ...], depth: int, sample: Optional[int]) -> Translation:
+    if len(args) == 2 and args[1] is Ellipsis:
+        return _container(tuple, args[0], depth, sample)
+    checks = [_predicate(translate(arg, depth - 1, sample)) for arg in args]
+
+    def check(arg) -> bool:
+        if not isinstance(arg, tuple) or len(arg) != len(checks):
+            return False
+        for element_check, a in zip(checks, arg):
+            if element_check is not None and not element_check(a):
+                return False
+        return True
+
+    return False, check
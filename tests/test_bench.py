@@ -0,0 +1,27 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from decorator_validation import bench
+
+
+class TestBench(unittest.TestCase):
+    def test_run_emits_json(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            bench.main(["--max-size", "10", "--repeat", "1", "--min-time", "0.0001"])
+        results = json.loads(output.getvalue())
+
+        self.assertEqual(
+            len(results["check_types"]),
+            len(bench.PARAM_COUNTS) * len(bench.CALL_STYLES) * len(bench.ANNOTATION_KINDS) * 2,
+        )
+        self.assertIn("overhead_ns", results["check_types"][0])
+        self.assertEqual(len(results["threads"]), len(bench.THREAD_COUNTS) * 3)
+        self.assertEqual({r["scaling"] for r in results["threads"] if r["threads"] == 1}, {1.0})
+        validators = {r["validator"] for r in results["std_validators"]}
+        self.assertTrue({"is_sequence_of", "is_iterable_of", "is_file", "is_num_as_str"} <= validators)
+
+
+if __name__ == "__main__":
+    unittest.main()
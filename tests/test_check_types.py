@@ -1,10 +1,31 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import unittest
-from typing import Dict, Union, Sequence
-from decorator_validation import check_types
-from decorator_validation import SkipTypeCheck
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, Union, Sequence
+from decorator_validation import check_types, make_validator
+from decorator_validation import SkipTypeCheck, set_mode, get_mode, stats, reset_stats
+from decorator_validation import instrumentation, warmup, set_executor, get_executor
+from decorator_validation import audit, validated_record
+import types
+from decorator_validation.batch import ARGUMENTS
+from decorator_validation.decorators import FINGERPRINT_CACHE_SIZE
+from decorator_validation.helpers import Annotation, Validator
+from decorator_validation.config import ALWAYS, OFF, sample, parse_mode
+from decorator_validation.typing_checks import translate
 from decorator_validation.std_validators import is_sequence_of
 import logging
 import platform
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestCheckTypes(unittest.TestCase):
@@ -63,6 +84,7 @@ class TestCheckTypes(unittest.TestCase):
         @check_types(some_additional_info=(Dict,))
         def foo(bar: int, message: str, some_additional_info: Dict):
             return True
+
         worked = False
         try:
             worked = foo(
@@ -77,9 +99,11 @@ class TestCheckTypes(unittest.TestCase):
     def test_for_class(self):
         class Something:
             ...
+
         @check_types(some_additional_info=Something)
         def foo(bar: int, message: str, some_additional_info: Dict):
             return True
+
         worked = False
         try:
             worked = foo(
@@ -185,6 +209,7 @@ class TestCheckTypes(unittest.TestCase):
         def print_elmnts(bar: Sequence[int]):
             for b in bar:
                 ...
+
         print_elmnts([1, 2, 3])
 
     def test_other_types_no_braces(self):
@@ -192,6 +217,7 @@ class TestCheckTypes(unittest.TestCase):
         def print_elmnts(bar: Sequence[int]):
             for b in bar:
                 ...
+
         print_elmnts([1, 2, 3])
 
         @check_types(bar=is_sequence_of(int))
@@ -208,7 +234,843 @@ class TestCheckTypes(unittest.TestCase):
 
         print_elmnts([1, 2])
         print_elmnts_2([1, 2])
-        print_elmnts_3([1, 2, 'str'])
+        print_elmnts_3([1, 2, "str"])
+
+    def test_compiled_wrapper(self):
+        @check_types(compile=True, b=is_sequence_of(int))
+        def foo(a: int, /, b, c: str = "x", *, d: float, e=None):
+            return a, b, c, d, e
+
+        self.assertEqual(foo(1, [2], d=1.0), (1, [2], "x", 1.0, None))
+        self.assertEqual(foo(1, b=[2], c="y", d=1.0, e=3), (1, [2], "y", 1.0, 3))
+        self.assertEqual(foo.__name__, "foo")
+        with self.assertRaises(TypeError):
+            foo(1.0, [2], d=1.0)
+        with self.assertRaises(TypeError):
+            foo(1, [2], c=3, d=1.0)
+        with self.assertRaises(TypeError):
+            foo(1, ["2"], d=1.0)
+
+    def test_compiled_wrapper_names(self):
+        class Checker:
+            @check_types(compile=True)
+            def isinstance(self, value: int):
+                return value
+
+        self.assertEqual(Checker().isinstance(1), 1)
+        with self.assertRaises(TypeError):
+            Checker().isinstance("1")
+
+        @check_types(compile=True)
+        def _dv_func(a: int):
+            return a
+
+        @check_types(compile=True)
+        def foo(_dv_fail: int, _dv_missing: str = "x"):
+            return _dv_fail, _dv_missing
+
+        self.assertEqual(_dv_func(1), 1)
+        self.assertEqual(_dv_func.__qualname__, "TestCheckTypes.test_compiled_wrapper_names.<locals>._dv_func")
+        self.assertEqual(foo(1), (1, "x"))
+        with self.assertRaises(TypeError):
+            foo(1, 2)
+        with self.assertRaises(TypeError):
+            _dv_func("1")
+
+    def test_compile_option_as_override(self):
+        @check_types(compile=int)
+        def foo(compile):
+            return True
+
+        self.assertEqual(foo(1), True)
+        with self.assertRaises(TypeError):
+            foo("1")
+
+
+class TestLazyPlan(unittest.TestCase):
+    def test_plan_built_on_first_call(self):
+        @check_types
+        def foo(bar: int):
+            return True
+
+        self.assertIsNone(foo.__build_plan__.plan)
+        foo(1)
+        self.assertIsNotNone(foo.__build_plan__.plan)
+
+    def test_warmup(self):
+        module = types.ModuleType("warmup_test")
+
+        @check_types
+        def foo(bar: int):
+            return True
+
+        class Foo:
+            @check_types
+            def method(self, bar: int):
+                return True
+
+            @staticmethod
+            @check_types
+            def static(bar: int):
+                return True
+
+        module.foo, module.Foo, module.bar = foo, Foo, 1
+        self.assertEqual(warmup(module), 3)
+        self.assertIsNotNone(Foo.static.__build_plan__.plan)
+
+        @check_types
+        def bar(bar: int):
+            return True
+
+        thread = warmup([bar], background=True)
+        thread.join()
+        self.assertIsNotNone(bar.__build_plan__.plan)
+        self.assertEqual(warmup(bar), 1)
+
+    def test_import_cost(self):
+        # modules the package must not load on import, beyond what typing and threading load themselves
+        code = (
+            "import sys, typing, threading\n"
+            + "before = set(sys.modules)\n"
+            + "import decorator_validation\n"
+            + "print(' '.join(set(sys.modules) - before))"
+        )
+        env = {k: v for k, v in os.environ.items() if k != "DECORATOR_VALIDATION_MODE"}
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+        loaded = set(result.stdout.split())
+        self.assertIn("decorator_validation", loaded)
+        unwanted = {"inspect", "asyncio", "re", "fractions", "decimal"}
+        unwanted |= {"decorator_validation.plan", "decorator_validation.codegen"}
+        self.assertEqual(loaded & unwanted, set())
+
+    def test_immutable_annotations(self):
+        annotation = Annotation(int, Annotation.OVERRIDE)
+        self.assertTrue(annotation.matches(1))
+        self.assertEqual(annotation.annotation, (int,))
+        for obj in (annotation, Validator(int)):
+            with self.assertRaises(AttributeError):
+                obj.annotation = str
+            with self.assertRaises(AttributeError):
+                del obj.validator
+
+    def test_concurrent_calls(self):
+        @check_types(b=is_sequence_of(int))
+        def foo(a: int, b, c: Union[int, str] = "x"):
+            return True
+
+        barrier = threading.Barrier(8, timeout=5)
+
+        def call(i):
+            barrier.wait()  # all threads race on the first call building the plan
+            results = []
+            for j in range(200):
+                results.append(foo(i, [j], c=j if j % 2 else "y"))
+                try:
+                    foo(str(i), [j])
+                except TypeError:
+                    results.append(True)
+            return all(results) and len(results) == 400
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertTrue(all(executor.map(call, range(8))))
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_type_only_plan(self):
+        @check_types
+        def foo(bar: Sequence, baz: Union[int, float], qux: Dict[str, int] = None):
+            return True
+
+        foo([], 1)
+        plan = foo.__build_plan__.plan
+        self.assertFalse(plan.type_only)
+        self.assertEqual(plan.abc_checks, 1)
+
+        @check_types(qux=SkipTypeCheck)
+        def bar(bar: Sequence, baz: Union[int, float], qux: Dict[str, int] = None):
+            return True
+
+        bar([], 1)
+        self.assertTrue(bar.__build_plan__.plan.type_only)
+
+    def test_fingerprint_calls(self):
+        for fingerprint in (None, True, False):
+
+            @check_types(fingerprint=fingerprint)
+            def foo(bar: Sequence, baz: Sequence, qux: int = 1):
+                return bar
+
+            for _ in range(2):
+                self.assertEqual(foo([1], (2,)), [1])
+                self.assertEqual(foo([1], baz="", qux=2), [1])
+                with self.assertRaises(TypeError):
+                    foo({1}, (2,))
+                with self.assertRaises(TypeError):
+                    foo([1], baz=(2,), qux="no int")
+                with self.assertRaises(TypeError):
+                    foo([1], (2,), "no int")
+
+    def test_fingerprint_cache_size(self):
+        @check_types(fingerprint=True)
+        def foo(bar: object):
+            return bar
+
+        classes = [type(f"Foo{i}", (), {}) for i in range(FINGERPRINT_CACHE_SIZE + 10)]
+        for cls in classes:
+            self.assertIsInstance(foo(cls()), cls)
+
+    def test_no_fingerprint_for_variadic(self):
+        @check_types(fingerprint=True)
+        def foo(bar: int, *args: int, **kwargs: int):
+            return len(args) + len(kwargs)
+
+        for n in range(FINGERPRINT_CACHE_SIZE + 10):
+            self.assertEqual(foo(1, *range(n), x=1), n + 1)
+        fingerprints = dict(zip(foo.__code__.co_freevars, foo.__closure__))["fingerprints"]
+        self.assertIsNone(fingerprints.cell_contents)
+        with self.assertRaisesRegex(TypeError, r"Parameter args\[0\]"):
+            foo(1, "no int")
+
+
+class TestExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        set_executor(None)
+        self.executor.shutdown()
+
+    def test_expensive_validators_run_last(self):
+        calls = []
+
+        @make_validator(expensive=True)
+        def is_expensive(arg):
+            calls.append(arg)
+            if arg != "ok":
+                raise ValueError("not ok")
+
+        self.assertTrue(is_expensive.expensive)
+
+        @check_types(bar=is_expensive)
+        def foo(bar, baz: int):
+            return True
+
+        with self.assertRaises(TypeError):
+            foo("ok", "no int")
+        self.assertEqual(calls, [])
+        self.assertTrue(foo("ok", 1))
+        with self.assertRaises(ValueError):
+            foo("not ok", 1)
+        self.assertEqual(calls, ["ok", "not ok"])
+
+    def test_expensive_validators_run_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other(arg):
+            barrier.wait()  # breaks if the validators run one after the other
+            return True
+
+        wait_for_other.expensive = True
+
+        @check_types(bar=wait_for_other, baz=wait_for_other, executor=self.executor)
+        def foo(bar, baz):
+            return True
+
+        self.assertTrue(foo(1, baz=2))
+
+    def test_failures_in_parameter_order(self):
+        def slow_fail(arg):
+            time.sleep(0.05)
+            return False
+
+        def fast_fail(arg):
+            return False
+
+        slow_fail.expensive = fast_fail.expensive = True
+
+        @check_types(bar=slow_fail, baz=fast_fail, instrument=True)
+        def foo(bar, baz):
+            return True
+
+        set_executor(self.executor)
+        self.assertIs(get_executor(), self.executor)
+        for call in (lambda: foo(1, 2), lambda: foo(baz=2, bar=1)):
+            with self.assertRaises(TypeError) as cm:
+                call()
+            self.assertIn("Parameter bar", str(cm.exception))
+
+    def test_timeout(self):
+        @make_validator(expensive=True)
+        def is_slow(arg):
+            time.sleep(0.2)
+
+        @check_types(bar=is_slow, executor=self.executor, timeout=0.01, compile=True)
+        def foo(bar):
+            return True
+
+        with self.assertRaises(FutureTimeoutError):
+            foo(1)
+
+    def test_async_function(self):
+        @make_validator(expensive=True)
+        def is_positive(arg):
+            if arg <= 0:
+                raise ValueError("not positive")
+
+        async def is_int(arg):
+            return isinstance(arg, int)
+
+        for executor in (None, self.executor):
+
+            @check_types(bar=is_positive, baz=is_int, executor=executor)
+            async def foo(bar, baz):
+                return bar
+
+            self.assertEqual(asyncio.run(foo(1, 2)), 1)
+            with self.assertRaises(ValueError):
+                asyncio.run(foo(-1, 2))
+            with self.assertRaises(TypeError):
+                asyncio.run(foo(1, "no int"))
+
+
+class TestValidateBatch(unittest.TestCase):
+    def setUp(self):
+        @make_validator
+        def is_positive(arg):
+            if arg <= 0:
+                raise ValueError(f"{arg} is not positive")
+
+        @check_types(count=is_positive)
+        def foo(name: str, values: Sequence, count=1, scale: Optional[float] = None):
+            return True
+
+        self.foo = foo
+
+    def test_rows(self):
+        rows = [("a", [1], 1), ("b", (2,), 2), (1, [3], 0), ("d", {4}, 4)]
+        result = check_types.validate_batch(self.foo, rows)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.failed, [False, False, True, True])
+        self.assertEqual(result.failures, {"name": [2], "values": [3], "count": [2]})
+        self.assertEqual(set(result.error(2)), {"name", "count"})
+        self.assertIn("ValueError: 0 is not positive", result.error(2)["count"])
+        self.assertIn("Parameter values", result.error(3)["values"])
+        self.assertEqual(result.error(0), {})
+        self.assertEqual(list(result.errors()), [2, 3])
+
+    def test_keyword_and_mixed_rows(self):
+        rows = [{"name": "a", "values": []}, {"name": "b", "values": [], "scale": "no float"}]
+        result = check_types.validate_batch(self.foo, rows)
+        self.assertEqual(result.failures, {"scale": [1]})
+        result = check_types.validate_batch(self.foo, iter(rows + [("c", [], -1), ("d",), ("e", ())]))
+        self.assertEqual(result.failed, [False, True, True, True, False])
+        self.assertEqual(result.failures, {"count": [2], "scale": [1], ARGUMENTS: [3]})
+        self.assertTrue(check_types.validate_batch(self.foo, []).ok)
+
+    def test_columns(self):
+        columns = {"name": ["a", "b", "c"], "values": [[]] * 3, "scale": array("d", [1.0, 2.0, 3.0])}
+        columns["count"] = [1, -1, 1]
+        result = check_types.validate_batch(self.foo, columns)
+        self.assertEqual(result.failed, [False, True, False])
+        result = check_types.validate_batch(self.foo, {"name": "ab", "values": "ab", "scale": array("q", [1, 2])})
+        self.assertEqual(result.failures, {"scale": [0, 1]})
+        with self.assertRaises(ValueError):
+            check_types.validate_batch(self.foo, {"name": ["a"], "count": [1, 2]})
+        # every row misses the values argument
+        result = check_types.validate_batch(self.foo, {"name": ["a", "b"]})
+        self.assertEqual(result.failures, {ARGUMENTS: [0, 1]})
+        self.assertIn("missing a required argument: 'values'", result.error(0)[ARGUMENTS])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_columns(self):
+        columns = {"name": numpy.array(["a", "b"]), "values": [[]] * 2, "scale": numpy.ones(2)}
+        columns["count"] = numpy.array([1, 0])
+        result = check_types.validate_batch(self.foo, columns)
+        self.assertIsInstance(result.failed, numpy.ndarray)
+        self.assertEqual(result.failed.tolist(), [False, True])
+        columns = {"name": ["a", "b"], "values": [[]] * 2, "scale": numpy.array([1.0, "a"], dtype=object)}
+        result = check_types.validate_batch(self.foo, columns)
+        self.assertEqual(result.failures, {"scale": [1]})
+
+    def test_undecorated_function(self):
+        def bar(a: int, b: List[int]):
+            return True
+
+        result = check_types.validate_batch(bar, [(1, [1]), (1, [1, "a"])])
+        self.assertEqual(result.failures, {"b": [1]})
+
+    def test_variadic_entries(self):
+        def bar(a: int, /, *args: int, **kwargs: str):
+            return True
+
+        result = check_types.validate_batch(bar, [(1, 2, "x"), (1, 2, 3)])
+        self.assertEqual(result.failures, {"args[1]": [0]})
+        result = check_types.validate_batch(bar, [{"x": "a"}, (1,), {"x": 1}, (1, "b")])
+        self.assertEqual(result.failures, {ARGUMENTS: [0, 2], "x": [2], "args[0]": [3]})
+        result = check_types.validate_batch(bar, {"x": ["a", 1]})
+        self.assertEqual(result.failures, {ARGUMENTS: [0, 1], "x": [1]})
+
+    def test_unbound_rows(self):
+        rows = [("a", []), ("a",), {"name": "a", "values": [], "unknown": 1}, ("a", [], 1, None, "too many")]
+        result = check_types.validate_batch(self.foo, rows)
+        self.assertEqual(result.failed, [False, True, True, True])
+        self.assertEqual(result.failures, {ARGUMENTS: [1, 2, 3]})
+        self.assertIn("unexpected keyword argument 'unknown'", result.error(2)[ARGUMENTS])
+
+        def bar(a: int, /):
+            return True
+
+        self.assertEqual(check_types.validate_batch(bar, [{"a": 1}]).failures, {ARGUMENTS: [0]})
+
+
+class TestVariadic(unittest.TestCase):
+    def test_args_and_kwargs(self):
+        for compile in (False, True):
+
+            @check_types(compile=compile)
+            def foo(bar: int, /, baz: str = "", *args: int, option: float = 1.0, **kwargs: str):
+                return bar, baz, args, option, kwargs
+
+            self.assertEqual(foo(1, "a", 2, 3, option=2.0, x="y"), (1, "a", (2, 3), 2.0, {"x": "y"}))
+            # a keyword named like the positional-only parameter ends up in **kwargs
+            self.assertEqual(foo(1, bar="y")[4], {"bar": "y"})
+            with self.assertRaisesRegex(TypeError, r"Parameter args\[1\]"):
+                foo(1, "a", 2, "no int")
+            with self.assertRaisesRegex(TypeError, "Parameter x:"):
+                foo(1, x=2)
+            with self.assertRaisesRegex(TypeError, "Parameter option:"):
+                foo(1, "a", 2, option="no float")
+            with self.assertRaisesRegex(TypeError, "Parameter bar:"):
+                foo(1, bar=1)
+
+    def test_compiled_method_named_list(self):
+        class Client:
+            @check_types(compile=True)
+            def list(self, limit: int, **filters: str):
+                return limit, filters
+
+        self.assertEqual(Client().list(3, name="a"), (3, {"name": "a"}))
+        with self.assertRaisesRegex(TypeError, "Parameter name:"):
+            Client().list(3, name=1)
+
+    def test_overrides(self):
+        @check_types(args=lambda arg: isinstance(arg, list), kwargs=(int, float))
+        def foo(*args, **kwargs):
+            return len(args) + len(kwargs)
+
+        self.assertEqual(foo([1], [2], a=1, b=1.5), 4)
+        with self.assertRaisesRegex(TypeError, r"Parameter args\[1\]"):
+            foo([1], (2,))
+        with self.assertRaisesRegex(TypeError, "Parameter b:"):
+            foo(a=1, b="no number")
+
+    def test_entry_overrides(self):
+        def foo(**kwargs: int):
+            return kwargs
+
+        for compile in (False, True):
+            decorated = check_types(compile=compile, x=str)(foo)
+            self.assertEqual(decorated(x="a", y=1), {"x": "a", "y": 1})
+            with self.assertRaisesRegex(TypeError, "Parameter x:"):
+                decorated(x=1)
+            with self.assertRaisesRegex(TypeError, "Parameter y:"):
+                decorated(x="a", y="b")
+
+    def test_sample(self):
+        @check_types(sample=10)
+        def foo(*args: int):
+            return len(args)
+
+        values = list(range(1000))
+        self.assertEqual(foo(*values), 1000)
+        values[1] = "not sampled"
+        self.assertEqual(foo(*values), 1000)
+        values[100] = "sampled"
+        with self.assertRaisesRegex(TypeError, r"Parameter args\[100\]"):
+            foo(*values)
+
+    def test_deferred_and_recorded(self):
+        @make_validator(expensive=True)
+        def is_int(arg):
+            assert isinstance(arg, int)
+
+        @check_types(executor=ThreadPoolExecutor(2), args=is_int)
+        def foo(*args):
+            return args
+
+        self.assertEqual(foo(1, 2), (1, 2))
+        with self.assertRaises(AssertionError):
+            foo(1, "no int")
+
+        @check_types(on_failure="record")
+        def bar(*args: int, **kwargs: int):
+            return args
+
+        audit.clear()
+        bar(1, "a", "b", x="y")
+        self.assertEqual([f.parameter for f in audit.failures()], ["args[1]", "args[2]", "x"])
+        audit.clear()
+
+
+class TestRecordFailures(unittest.TestCase):
+    def setUp(self):
+        audit.clear()
+
+    def tearDown(self):
+        audit.clear()
+        audit.set_capacity(audit.DEFAULT_CAPACITY)
+        audit.set_log_interval(audit.DEFAULT_LOG_INTERVAL)
+
+    def test_record(self):
+        @make_validator
+        def is_positive(arg):
+            if arg <= 0:
+                raise ValueError("not positive")
+
+        @check_types(on_failure="record", baz=is_positive)
+        def foo(bar: int, baz=1):
+            return bar
+
+        self.assertEqual(foo("no int"), "no int")
+        self.assertEqual(foo(1, baz=-1), 1)
+        self.assertEqual(foo(1), 1)
+        failures = audit.failures()
+        self.assertEqual([(f.parameter, f.input_type) for f in failures], [("bar", str), ("baz", int)])
+        self.assertTrue(failures[0].function.endswith("foo"))
+        self.assertIn("TypeError for Parameter bar: input_type: <class 'str'>", failures[0].message)
+
+        with self.assertRaises(ValueError):
+            check_types(on_failure="ignore")
+
+    def test_ring_buffer_and_logging(self):
+        @check_types(on_failure="record")
+        def foo(bar: int):
+            return bar
+
+        audit.set_capacity(3)
+        audit.set_log_interval(3600)
+        with self.assertLogs("decorator_validation", level="WARNING") as logs:
+            for i in range(10):
+                foo(str(i))
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(len(audit.failures()), 3)
+        with self.assertRaises(ValueError):
+            audit.set_capacity(0)
+
+    def test_record_async(self):
+        async def is_int(arg):
+            return isinstance(arg, int)
+
+        async def raises(arg):
+            raise RuntimeError("broken validator")
+
+        @check_types(on_failure="record", bar=is_int, baz=raises)
+        async def foo(bar, baz):
+            return bar
+
+        self.assertEqual(asyncio.run(foo("no int", 1)), "no int")
+        self.assertEqual([f.parameter for f in audit.failures()], ["bar", "baz"])
+
+
+class TestTypingAnnotations(unittest.TestCase):
+    def assertValid(self, func, *valid, invalid=()):
+        for arg in valid:
+            self.assertEqual(func(arg), True)
+        for arg in invalid:
+            with self.assertRaises(TypeError):
+                func(arg)
+
+    def test_optional_union(self):
+        @check_types
+        def foo(bar: Optional[Union[int, List[str]]]):
+            return True
+
+        self.assertValid(foo, None, 1, ["a"], [], invalid=("a", [1], 1.0))
+
+    def test_containers(self):
+        @check_types
+        def foo(bar: Dict[str, List[Tuple[int, ...]]]):
+            return True
+
+        self.assertValid(foo, {}, {"a": []}, {"a": [(1, 2), ()]}, invalid=([], {1: []}, {"a": [(1, "2")]}))
+
+        @check_types
+        def fixed(bar: Tuple[int, str]):
+            return True
+
+        self.assertValid(fixed, (1, "a"), invalid=((1,), (1, 2), [1, "a"]))
+
+        @check_types
+        def empty(bar: Tuple[()], baz: Tuple = ()):
+            return True
+
+        self.assertValid(empty, (), invalid=((1,), [], None))
+        self.assertTrue(empty((), (1, "a")))
+        if sys.version_info >= (3, 9):
+            self.assertEqual(translate(tuple[()])[1](()), True)
+            self.assertEqual(translate(tuple[()])[1]((1,)), False)
+
+    def test_string_annotations(self):
+        @check_types
+        def foo(bar: "int", baz: "List[str]" = ()):
+            return True
+
+        self.assertValid(foo, 1, invalid=("a",))
+        with self.assertRaises(TypeError):
+            foo(1, ["a", 1])
+
+    def test_literal_and_type(self):
+        @check_types
+        def foo(bar: Literal["a", 1]):
+            return True
+
+        self.assertValid(foo, "a", 1, invalid=("b", True, 1.0, []))
+
+        @check_types
+        def cls(bar: Type[Exception]):
+            return True
+
+        self.assertValid(cls, ValueError, invalid=(int, ValueError()))
+
+    def test_any_and_override(self):
+        @check_types(other=List[int])
+        def foo(bar: Any, other):
+            return True
+
+        self.assertEqual(foo(object(), [1]), True)
+        with self.assertRaises(TypeError):
+            foo(1, ["1"])
+
+    def test_depth_and_sample(self):
+        @check_types(depth=1)
+        def shallow(bar: List[List[int]]):
+            return True
+
+        self.assertValid(shallow, [["not checked"]], invalid=(["a"],))
+
+        @check_types(sample=10)
+        def sampled(bar: List[int]):
+            return True
+
+        self.assertValid(sampled, [1] * 55 + ["a"] + [1] * 45, invalid=(["a"] + [1] * 100,))
+
+    def test_translation_is_shared(self):
+        self.assertIs(translate(List[int]), translate(List[int]))
+        self.assertEqual(translate(Union[int, str]), (True, (int, str)))
+        self.assertIsNone(translate(Optional[Any]))
+
+    def test_compiled(self):
+        @check_types(compile=True)
+        def foo(bar: Optional[List[int]] = None):
+            return True
+
+        self.assertValid(foo, None, [1], invalid=(["a"],))
+
+
+class TestAsync(unittest.TestCase):
+    def test_async_function(self):
+        @check_types
+        async def foo(bar: int):
+            return bar
+
+        self.assertEqual(asyncio.run(foo(1)), 1)
+        self.assertTrue(asyncio.iscoroutinefunction(foo))
+        with self.assertRaises(TypeError):
+            asyncio.run(foo("no int"))
+
+    def test_async_validators_run_concurrently(self):
+        @make_validator
+        async def slow_positive(number):
+            await asyncio.sleep(0.1)
+            if number <= 0:
+                raise ValueError(f"{number} is not positive")
+
+        @check_types(a=slow_positive, b=slow_positive, c=slow_positive)
+        async def foo(a: int, b: int, c: int, d: str = ""):
+            return a + b + c
+
+        start = time.perf_counter()
+        self.assertEqual(asyncio.run(foo(1, 2, c=3)), 6)
+        self.assertLess(time.perf_counter() - start, 0.25)
+        with self.assertRaises(ValueError):
+            asyncio.run(foo(1, -2, c=3))
+        # sync checks fail before any async validator is started
+        with self.assertRaises(TypeError):
+            asyncio.run(foo(1, 2, 3, d=4))
+
+    def test_async_validator_timeout(self):
+        async def never(arg):
+            await asyncio.sleep(10)
+            return True
+
+        @check_types(timeout=0.05, bar=never)
+        async def foo(bar):
+            return True
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(foo(1))
+
+    def test_async_validator_requires_async_function(self):
+        async def valid(arg):
+            return True
+
+        @check_types(bar=valid)
+        def foo(bar):
+            return True
+
+        with self.assertRaises(TypeError):
+            foo(1)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.set_hook(None)
+
+    def test_not_instrumented_by_default(self):
+        @check_types
+        def not_instrumented(bar: int):
+            return True
+
+        not_instrumented(1)
+        self.assertFalse(any(name.endswith("not_instrumented") for name in stats()))
+
+    def test_stats(self):
+        def positive(number):
+            return number > 0
+
+        @check_types(instrument=True, bar=positive)
+        def foo(bar: int, message: str = ""):
+            return True
+
+        name = f"{foo.__module__}.{foo.__qualname__}"
+        reset_stats()
+        foo(1)
+        foo(2, message="a")
+        with self.assertRaises(TypeError):
+            foo(-1)
+        with self.assertRaises(TypeError):
+            foo(1, message=1)
+
+        function_stats = stats()[name]
+        self.assertEqual((function_stats["calls"], function_stats["failures"]), (4, 2))
+        self.assertGreaterEqual(function_stats["max_ns"], 0)
+        bar, message = function_stats["parameters"]["bar"], function_stats["parameters"]["message"]
+        self.assertEqual((bar["calls"], bar["failures"]), (4, 1))
+        self.assertEqual((message["calls"], message["failures"]), (2, 1))
+        self.assertEqual(message["total_ns"], 0)
+
+        reset_stats()
+        self.assertEqual(stats()[name]["calls"], 0)
+
+    def test_enable_and_hook(self):
+        records = []
+        instrumentation.set_hook(lambda name, elapsed_ns, failed: records.append((name, failed)))
+        instrumentation.enable()
+
+        @check_types
+        async def foo(bar: int):
+            return True
+
+        asyncio.run(foo(1))
+        with self.assertRaises(TypeError):
+            asyncio.run(foo("no int"))
+        name = f"{foo.__module__}.{foo.__qualname__}"
+        self.assertEqual(records, [(name, False), (name, True)])
+
+
+class TestValidationMode(unittest.TestCase):
+    def setUp(self):
+        self._mode = get_mode()
+
+    def tearDown(self):
+        set_mode(self._mode)
+
+    def test_parse_mode(self):
+        self.assertIs(parse_mode("off"), OFF)
+        self.assertIs(parse_mode(" Always "), ALWAYS)
+        self.assertEqual(parse_mode("sample(0.25)").period, 4)
+        self.assertEqual((sample(0.4).share, sample(0.4).period), (2, 5))
+        self.assertEqual(sample(1e-9).period, 10**6)
+        self.assertIs(sample(1), ALWAYS)
+        with self.assertRaises(ValueError):
+            parse_mode("sometimes")
+        with self.assertRaises(ValueError):
+            sample(0)
+
+    def test_off_returns_undecorated(self):
+        def foo(bar: int):
+            return True
+
+        set_mode("off")
+        self.assertIs(check_types(foo), foo)
+        self.assertIs(check_types(compile=True)(foo), foo)
+
+    def test_switch_at_runtime(self):
+        @check_types
+        def foo(bar: int):
+            return True
+
+        set_mode(OFF)
+        self.assertEqual(foo("no int"), True)
+        set_mode(ALWAYS)
+        with self.assertRaises(TypeError):
+            foo("no int")
+
+    def test_sample(self):
+        for compile in (False, True):
+
+            @check_types(compile=compile)
+            def foo(bar: int = 1):
+                return bar
+
+            set_mode(sample(0.25))
+            failures = 0
+            for _ in range(8):
+                try:
+                    foo("no int")
+                except TypeError:
+                    failures += 1
+            self.assertEqual(failures, 2)
+            self.assertEqual(foo(), 1)
+
+            set_mode(sample(0.7))
+            failures = 0
+            for _ in range(1000):
+                try:
+                    foo("no int")
+                except TypeError:
+                    failures += 1
+            self.assertEqual(failures, 700)
+
+    def test_sample_parameter_named_next(self):
+        @check_types(compile=True)
+        def page(items: list, next=None):
+            return next
+
+        @validated_record
+        class Page:
+            next: str
+
+        set_mode(sample(0.5))
+        for i in range(4):
+            self.assertEqual(page([], next="token"), "token")
+            self.assertEqual(Page("token").next, "token")
+
+    def test_mode_per_function(self):
+        @check_types(mode="always")
+        def foo(bar: int):
+            return True
+
+        @check_types(mode=OFF, compile=True)
+        def bar(bar: int):
+            return True
+
+        set_mode("off")
+        with self.assertRaises(TypeError):
+            foo("no int")
+        set_mode("always")
+        self.assertEqual(bar("no int"), True)
 
 
 if __name__ == "__main__":
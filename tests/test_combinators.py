@@ -0,0 +1,95 @@
+import unittest
+from typing import List, Optional
+from decorator_validation import check_types, make_validator, all_of, any_of, not_
+from decorator_validation.std_validators import is_num_as_str
+
+
+@make_validator
+def is_short(arg):
+    if len(arg) > 3:
+        raise ValueError(f"{arg} is too long")
+
+
+class TestCombinators(unittest.TestCase):
+    def test_all_of(self):
+        validator = all_of(str, is_num_as_str, is_short)
+        self.assertTrue(validator("12"))
+        self.assertFalse(validator("1234"))  # raising members count as failure
+        self.assertFalse(validator("abc"))
+        self.assertFalse(validator(12))
+
+        @check_types(bar=validator)
+        def foo(bar):
+            return True
+
+        self.assertTrue(foo("1"))
+        with self.assertRaises(TypeError):
+            foo("1234")
+
+    def test_any_of(self):
+        validator = any_of(int, is_num_as_str, float, Optional[List[int]])
+        self.assertTrue(validator(1))
+        self.assertTrue(validator(1.5))
+        self.assertTrue(validator("1.5"))
+        self.assertTrue(validator(None))
+        self.assertTrue(validator([1]))
+        self.assertFalse(validator(["a"]))
+        self.assertFalse(validator("abc"))
+        self.assertEqual(validator.order()[0], (int, float))
+
+    def test_not(self):
+        validator = not_(is_short)
+        self.assertTrue(validator("1234"))
+        self.assertFalse(validator("12"))
+        self.assertTrue(not_(str)(1))
+        self.assertIs(not_(validator), is_short)
+
+    def test_flatten(self):
+        inner = all_of(str, is_short)
+        validator = all_of(inner, all_of(is_num_as_str))
+        self.assertEqual(validator.validators, (str, is_short, is_num_as_str))
+        self.assertEqual(any_of(inner, int).validators, (inner, int))
+        self.assertTrue(all_of(is_short, expensive_validator).expensive)
+
+    def test_adaptive(self):
+        calls = []
+
+        def slow(arg):
+            calls.append(arg)
+            sum(range(1000))
+            return True
+
+        validator = all_of(slow, is_num_as_str, adaptive=True, period=100, window=10)
+        self.assertEqual(validator.order(), [slow, is_num_as_str])
+        for _ in range(10):
+            self.assertFalse(validator("abc"))
+        self.assertEqual(validator.order(), [is_num_as_str, slow])
+        calls.clear()
+        for _ in range(40):  # up to the next measurement
+            self.assertFalse(validator("abc"))
+            self.assertTrue(validator("1"))
+        self.assertEqual(calls, ["1"] * 40)
+
+        with self.assertRaises(ValueError):
+            any_of(int, adaptive=True, period=10, window=20)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            all_of()
+
+        async def is_async(arg):
+            return True
+
+        with self.assertRaises(TypeError):
+            any_of(is_async)
+
+
+def expensive_validator(arg):
+    return True
+
+
+expensive_validator.expensive = True
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import pickle
+import unittest
+from typing import ClassVar, List, Optional
+from decorator_validation import validated_record, make_validator, set_mode
+from decorator_validation.std_validators import is_num_as_str
+
+
+@validated_record(amount=is_num_as_str)
+class Payment:
+    amount: str
+    tags: List[str]
+    note: Optional[str] = None
+    currency: ClassVar[str] = "EUR"
+
+    def describe(self):
+        return f"{self.amount} {self.currency}"
+
+
+@validated_record(validate_assignment=True)
+class Point:
+    x: int
+    y: int = 0
+
+
+@validated_record
+class Point3D(Point):
+    z: int = 0
+
+
+class TestValidatedRecord(unittest.TestCase):
+    def test_init(self):
+        payment = Payment("1.5", ["a"])
+        self.assertEqual(payment.amount, "1.5")
+        self.assertIsNone(payment.note)
+        self.assertEqual(payment.describe(), "1.5 EUR")
+        self.assertEqual(Payment(amount="2", tags=[], note="x").note, "x")
+        with self.assertRaises(TypeError):
+            Payment("no number", [])
+        with self.assertRaises(TypeError):
+            Payment("1", ["a", 1])
+        with self.assertRaises(TypeError):
+            Payment("1", [], note=1)
+        with self.assertRaises(TypeError):
+            Payment("1")
+
+    def test_slots(self):
+        payment = Payment("1", [])
+        self.assertFalse(hasattr(payment, "__dict__"))
+        with self.assertRaises(AttributeError):
+            payment.other = 1
+        self.assertEqual(Payment.__slots__, ("amount", "tags", "note"))
+        self.assertEqual(Payment.__qualname__, "Payment")
+
+    def test_repr_eq(self):
+        self.assertEqual(repr(Point(1)), "Point(x=1, y=0)")
+        self.assertEqual(Point(1, 2), Point(1, 2))
+        self.assertNotEqual(Point(1, 2), Point(1, 3))
+        self.assertEqual(pickle.loads(pickle.dumps(Point(1, 2))), Point(1, 2))
+
+    def test_validate_assignment(self):
+        point = Point(1)
+        point.y = 3
+        self.assertEqual(point.y, 3)
+        with self.assertRaises(TypeError):
+            point.y = "no int"
+        payment = Payment("1", [])
+        payment.amount = "no number"  # not validated without validate_assignment
+        self.assertEqual(payment.amount, "no number")
+
+    def test_inheritance(self):
+        point = Point3D(1, 2, 3)
+        self.assertEqual((point.x, point.y, point.z), (1, 2, 3))
+        self.assertEqual(Point3D.__slots__, ("z",))
+        self.assertIsInstance(point, Point)
+        with self.assertRaises(TypeError):
+            Point3D(1, 2, "no int")
+        with self.assertRaises(TypeError):
+            point.x = "no int"
+        with self.assertRaises(TypeError):
+            point.z = "no int"
+
+    def test_invalid_records(self):
+        with self.assertRaises(TypeError):
+
+            @validated_record
+            class Foo:
+                bar: int = 1
+                baz: int
+
+        with self.assertRaises(ValueError):
+
+            @validated_record
+            class Bar:
+                bar: list = []
+
+        @make_validator
+        async def is_int(arg):
+            assert isinstance(arg, int)
+
+        with self.assertRaises(TypeError):
+            validated_record(bar=is_int)(type("Baz", (), {"__annotations__": {"bar": int}}))
+
+        with self.assertRaises(TypeError):
+
+            @validated_record
+            class Qux:
+                bar: int
+
+                def __init__(self, bar):
+                    self.bar = bar
+
+        with self.assertRaises(TypeError):
+            validated_record(type("Quux", (), {"__annotations__": {"_dv_fail": int}}))
+
+    def test_string_annotations(self):
+        @validated_record
+        class Item:
+            name: "str"
+            count: "int" = 1
+
+        self.assertEqual(Item("a").count, 1)
+        with self.assertRaises(TypeError):
+            Item(1)
+        with self.assertRaises(TypeError):
+            Item("a", "no int")
+
+    def test_zero_argument_super(self):
+        class Base:
+            def describe(self):
+                return "base"
+
+        @validated_record
+        class Child(Base):
+            x: int
+
+            def __repr__(self):
+                return f"<{super().__repr__().split()[0]}>"
+
+            def describe(self):
+                return f"child of {super().describe()}"
+
+            @property
+            def kind(self):
+                return __class__.__name__
+
+            @classmethod
+            def make(cls):
+                return super().__new__(cls)
+
+        child = Child(1)
+        self.assertTrue(repr(child).startswith("<<"))
+        self.assertEqual(child.describe(), "child of base")
+        self.assertEqual(child.kind, "Child")
+        self.assertIsInstance(Child.make(), Child)
+
+    def test_post_init(self):
+        @validated_record
+        class Range:
+            low: int
+            high: int
+
+            def __post_init__(self):
+                if self.low > self.high:
+                    raise ValueError("low > high")
+
+        self.assertEqual(Range(1, 2).high, 2)
+        with self.assertRaises(ValueError):
+            Range(2, 1)
+        try:
+            set_mode("off")
+            with self.assertRaises(ValueError):
+                Range(2, 1)
+        finally:
+            set_mode("always")
+
+    def test_mode(self):
+        try:
+            set_mode("off")
+            self.assertEqual(Point("no int").x, "no int")
+        finally:
+            set_mode("always")
+        with self.assertRaises(TypeError):
+            Point("no int")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from typing import Dict, List, Literal, Optional
+from decorator_validation import check_types, make_validator, SkipTypeCheck
+from decorator_validation.schema import schema, optional
+
+
+@make_validator
+def is_positive(arg):
+    if arg <= 0:
+        raise ValueError(f"{arg} is not positive")
+
+
+ORDER = {
+    "id": int,
+    "customer": {"name": str, optional("email"): Optional[str]},
+    "items": [{"sku": str, "quantity": is_positive, "price": (int, float)}],
+    "status": Literal["open", "paid"],
+    "extra": SkipTypeCheck,
+}
+
+
+def make_order(n_items=2):
+    return {
+        "id": 1,
+        "customer": {"name": "a"},
+        "items": [{"sku": f"s{i}", "quantity": i + 1, "price": 1.5} for i in range(n_items)],
+        "status": "open",
+        "extra": object(),
+    }
+
+
+class TestSchema(unittest.TestCase):
+    def test_valid(self):
+        validator = schema(ORDER)
+        self.assertTrue(validator(make_order()))
+        self.assertTrue(validator({**make_order(), "unknown": 1}))
+        self.assertEqual(validator.errors(make_order()), [])
+
+    def test_first_failure(self):
+        order = make_order()
+        order["items"][1]["quantity"] = -1
+        order["status"] = "lost"
+        with self.assertRaisesRegex(TypeError, r"\$\['items'\]\[1\]\['quantity'\]: ValueError: -1 is not positive$"):
+            schema(ORDER)(order)
+
+    def test_collect(self):
+        order = make_order()
+        del order["customer"]["name"]
+        order["items"][0]["price"] = "1.5"
+        order["status"] = "lost"
+        self.assertEqual(
+            schema(ORDER, collect=True).errors(order),
+            [
+                "$['customer']: missing key 'name'",
+                "$['items'][0]['price']: required (<class 'int'>, <class 'float'>) but got <class 'str'>",
+                "$['status']: required typing.Literal['open', 'paid'] but got <class 'str'>",
+            ],
+        )
+
+    def test_limits(self):
+        order = make_order(1000)
+        order["items"][1]["sku"] = 1
+        self.assertTrue(schema(ORDER, sample=10)(order))
+        order["items"][100]["sku"] = 1
+        self.assertEqual(len(schema(ORDER, sample=10, collect=True).errors(order)), 1)
+        # deeper than depth only the containers are checked
+        self.assertTrue(schema(ORDER, depth=1)(order))
+        self.assertNotEqual(schema(ORDER, depth=1).errors({**order, "items": {}}), [])
+        self.assertEqual(schema(ORDER, max_keys=4).errors(make_order()), ["$: 5 keys, at most 4 are allowed"])
+        self.assertEqual(schema(ORDER, strict=True).errors({**make_order(), "x": 1}), ["$: unexpected keys ['x']"])
+
+    def test_typing_annotations_and_nesting(self):
+        item = schema({"tags": List[str], "counts": Dict[str, int]})
+        validator = schema({"items": [item], "list_of_lists": [[int]]})
+        self.assertTrue(validator({"items": [{"tags": ["a"], "counts": {"a": 1}}], "list_of_lists": [[1], []]}))
+        self.assertEqual(
+            validator.errors({"items": [{"tags": [1], "counts": {}}], "list_of_lists": [[1, "a"]]}),
+            ["$['items'][0]['tags']: required typing.List[str] but got <class 'list'>"],
+        )
+        with self.assertRaises(ValueError):
+            schema([int, str])
+        with self.assertRaises(TypeError):
+            schema({"id": "int"})
+
+    def test_override(self):
+        @check_types(order=schema(ORDER))
+        def foo(order: dict):
+            return order["id"]
+
+        self.assertEqual(foo(make_order()), 1)
+        with self.assertRaises(TypeError):
+            foo({"id": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
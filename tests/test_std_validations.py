@@ -1,10 +1,35 @@
+import re
+import sys
 import unittest
-from decorator_validation.decorators import check_types
-from decorator_validation.std_validators import is_file, is_iterable_of, is_sequence_of, is_num_as_str
+from array import array
+from itertools import islice
+from decorator_validation.decorators import check_types, cached_validator
+from decorator_validation.std_validators import (
+    is_file,
+    is_file_cached,
+    are_files,
+    are_dirs,
+    batch_path_validator,
+    is_iterable_of,
+    is_sequence_of,
+    is_num_as_str,
+    are_nums_as_str,
+    is_array,
+    has_magic,
+    min_size,
+    csv_header_is,
+)
+from decorator_validation import all_of
+import tempfile
 import logging
 from pathlib import Path
 from typing import Iterable, Union, Sequence
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TempFile:
     def __init__(self, name: str):
@@ -50,6 +75,120 @@ class TestStandardValidations(unittest.TestCase):
                 worked = False
         self.assertNotEqual(worked, True)
 
+    def test_cached_validator(self):
+        calls = []
+
+        @cached_validator(maxsize=2, ttl=None)
+        def positive(number):
+            calls.append(number)
+            return number > 0
+
+        for number in (1, 1, 2, -1, -1, 1):
+            positive(number)
+        self.assertEqual(calls, [1, 2, -1, -1])
+        self.assertEqual(positive.cache_info(), (2, 4, 2, 2))
+        positive(3)  # evicts 2, the least recently used
+        positive(2)
+        self.assertEqual(calls[-2:], [3, 2])
+        positive.cache_clear()
+        self.assertEqual(positive.cache_info(), (0, 0, 2, 0))
+
+    def test_cached_validator_ttl(self):
+        calls = []
+
+        @cached_validator(ttl=0)
+        def always(arg):
+            calls.append(arg)
+            return True
+
+        always("a")
+        always("a")
+        self.assertEqual(calls, ["a", "a"])
+
+    def test_cached_validator_unhashable(self):
+        calls = []
+
+        @cached_validator()
+        def always(arg):
+            calls.append(arg)
+            return True
+
+        always(["a"])
+        always(["a"])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(always.cache_info().currsize, 0)
+
+    def test_is_file_cached(self):
+        is_file_cached.cache_clear()
+        with TempFile("test.txt") as temp:
+            temp.write("hello")
+            self.assertTrue(is_file_cached("test.txt"))
+            self.assertTrue(is_file_cached("test.txt"))
+            with self.assertRaises(TypeError):
+                is_file_cached("test2.txt")
+        self.assertEqual(is_file_cached.cache_info().hits, 1)
+
+    def test_file_content(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parquet = Path(directory) / "data.parquet"
+            parquet.write_bytes(b"PAR1" + bytes(1000) + b"PAR1")
+            table = Path(directory) / "data.csv"
+            table.write_text('\ufeffid,"name, full"\r\n1,a\n', encoding="utf-8")
+
+            self.assertTrue(has_magic(b"PAR1")(parquet))
+            self.assertTrue(has_magic(b"PAR1", offset=-4)(str(parquet)))
+            self.assertTrue(min_size(1008)(parquet))
+            self.assertTrue(csv_header_is(["id", "name, full"])(table))
+            for validator, file in (
+                (has_magic(b"PAR1"), table),
+                (min_size(1009), parquet),
+                (csv_header_is(["id"]), table),
+                (csv_header_is(["id", "name, full"], max_size=8), table),
+                (min_size(0), directory),
+                (has_magic(b"PAR1"), Path(directory) / "missing.parquet"),
+            ):
+                with self.assertRaises(TypeError):
+                    validator(file)
+            with self.assertRaises(ValueError):
+                has_magic(b"")
+
+    def test_file_content_merged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parquet = Path(directory) / "data.parquet"
+            parquet.write_bytes(b"PAR1" + bytes(1000) + b"PAR1")
+            validator = all_of(is_file, has_magic(b"PAR1"), has_magic(b"PAR1", offset=-4), min_size(8))
+            self.assertEqual(len(validator.order()), 1)
+            self.assertTrue(validator(parquet))
+            self.assertFalse(validator(Path(directory) / "missing.parquet"))
+            parquet.write_bytes(b"PAR1" + bytes(1000))
+            self.assertFalse(validator(parquet))
+            # the cache of is_file_cached is kept
+            self.assertEqual(len(all_of(is_file_cached, min_size(8)).order()), 2)
+
+    def test_are_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = [Path(directory) / f"{i}.txt" for i in range(10)]
+            for file in files:
+                file.write_text("hello")
+            (Path(directory) / "sub").mkdir()
+            single = Path(directory) / "sub" / "single.txt"
+            single.write_text("hello")
+
+            self.assertTrue(are_files(files + [str(single)]))
+            self.assertTrue(are_dirs([directory, Path(directory) / "sub"]))
+            # listing and stat-ing give the same answer
+            self.assertTrue(batch_path_validator(min_scan=1000)(files))
+
+            missing = [Path(directory) / "missing.txt", Path(directory) / "nodir" / "missing.txt"]
+            with self.assertRaises(TypeError) as context:
+                are_files(files + missing)
+            for file in missing:
+                self.assertIn(str(file), str(context.exception))
+            with self.assertRaises(TypeError):
+                are_files([Path(directory) / "sub"] * 5)
+            with self.assertRaises(TypeError):
+                are_files(str(single))
+
     def test_is_iterable_of_correct(self):
         @check_types(bar=is_iterable_of(str))
         def foo(bar: Iterable[str]):
@@ -187,6 +326,178 @@ class TestStandardValidations(unittest.TestCase):
             pass
         self.assertEqual(res, False)
 
+    def test_num_as_str_without_exceptions(self):
+        for number in ("1", " -1_000.5e-3 ", ".5", "1.", "inf", "-Infinity", "NaN", "\u0661\u0662"):
+            self.assertTrue(is_num_as_str(number), number)
+        for no_number in ("", ".", "1__0", "_1", "1e", "e5", "0x10", "1.2.3", "infinit", "abc", 1, None):
+            self.assertFalse(is_num_as_str(no_number), no_number)
+        # the same whitespace as float() is accepted around the number
+        for space in map(chr, range(sys.maxunicode + 1)):
+            if space.isspace():
+                try:
+                    parses = float(f"{space}1{space}") == 1
+                except ValueError:
+                    parses = False
+                self.assertEqual(is_num_as_str(f"{space}1{space}"), parses, repr(space))
+        self.assertFalse(is_num_as_str("1\x1c"))
+
+        @check_types(number=is_num_as_str)
+        def foo(number: str):
+            return True
+
+        with self.assertRaises(TypeError):
+            foo("abc")
+
+    def test_are_nums_as_str(self):
+        self.assertTrue(are_nums_as_str(["1", "2.5", " 3e3"]))
+        self.assertTrue(are_nums_as_str(("1", "2")))
+        self.assertTrue(are_nums_as_str(iter(["1"])))
+        with self.assertRaises(TypeError) as cm:
+            are_nums_as_str(["1", "a", "2", "1__0"])
+        self.assertIn("2 of 4", str(cm.exception))
+        self.assertIn("1: 'a'", str(cm.exception))
+        with self.assertRaises(TypeError):
+            are_nums_as_str(["1", 2])
+        with self.assertRaises(TypeError):
+            are_nums_as_str("12")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_are_nums_as_str_numpy(self):
+        self.assertTrue(are_nums_as_str(numpy.array(["1", "22", "1.5", "nan"])))
+        with self.assertRaises(TypeError) as cm:
+            are_nums_as_str(numpy.array([["1", "x"], ["2", "3"]]))
+        self.assertIn("1: 'x'", str(cm.exception))
+        with self.assertRaises(TypeError):
+            are_nums_as_str(numpy.array([b"1"]))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_is_array(self):
+        validator = is_array(dtype=float, shape=(None, 3), contiguous=True, finite=True, range=(0, 1))
+        values = numpy.random.rand(100, 3)
+        self.assertTrue(validator(values))
+        self.assertTrue(validator(values.astype(numpy.float32)))
+        for invalid in (values.T, values[:, :2], values.astype(int), values[::2], values.tolist()):
+            with self.assertRaises(TypeError):
+                validator(invalid)
+        for index, value in (((5, 1), numpy.nan), ((7, 2), numpy.inf), ((9, 0), 1.5), ((3, 0), -0.5)):
+            invalid = values.copy()
+            invalid[index] = value
+            with self.assertRaisesRegex(TypeError, re.escape(f"at index {index}")):
+                validator(invalid)
+
+        @check_types(points=validator)
+        def foo(points):
+            return len(points)
+
+        self.assertEqual(foo(values), 100)
+        with self.assertRaises(TypeError):
+            foo(values + 1)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_is_array_options(self):
+        for dtype in (float, "float64", numpy.floating, numpy.dtype("<f8"), (int, float)):
+            self.assertTrue(is_array(dtype=dtype)(numpy.zeros(2)))
+        for dtype in (numpy.float32, int, str):
+            with self.assertRaises(TypeError):
+                is_array(dtype=dtype)(numpy.zeros(2))
+        self.assertTrue(is_array(dtype=str)(numpy.array(["ab"])))
+        self.assertTrue(is_array(shape=(2, None))(numpy.zeros((2, 5))))
+        self.assertTrue(is_array(contiguous="F")(numpy.zeros((2, 5)).T))
+        self.assertTrue(is_array(range=(0, None), finite=True)(numpy.arange(5)))
+        self.assertTrue(is_array(range=(0, 1))(numpy.zeros(0)))
+        with self.assertRaises(TypeError):
+            is_array(finite=True)(numpy.array([1 + 1j, numpy.nan]))
+        with self.assertRaises(TypeError):
+            is_array(range=(0, 1))(numpy.array(["a"]))
+        with self.assertRaises(ValueError):
+            is_array(contiguous="A")
+
+    def test_buffer_elements(self):
+        self.assertTrue(is_sequence_of(float)(array("d", [1.0, 2.0])))
+        self.assertTrue(is_sequence_of(float)(memoryview(array("f", [1.0]))))
+        self.assertTrue(is_iterable_of(int)(b"bytes"))
+        self.assertTrue(is_sequence_of(str)(array("d")))
+        with self.assertRaises(TypeError):
+            is_sequence_of(int)(array("d", [1.0]))
+        with self.assertRaises(TypeError):
+            is_iterable_of((str, float))(bytearray(b"bytes"))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_elements(self):
+        self.assertTrue(is_sequence_of(float)(numpy.zeros(3)))
+        self.assertTrue(is_sequence_of(float)(numpy.zeros(3, dtype=numpy.float32)))
+        self.assertTrue(is_iterable_of(int)(numpy.arange(3, dtype=numpy.uint8)))
+        self.assertTrue(is_sequence_of(str)(numpy.array(["a", "b"])))
+        with self.assertRaises(TypeError):
+            is_sequence_of(int)(numpy.zeros(3))
+        # object arrays are checked element wise
+        with self.assertRaises(TypeError):
+            is_sequence_of(int)(numpy.array([1, "a"], dtype=object))
+
+    def test_sampled_elements(self):
+        data = list(range(10_000))
+        data[5_000] = "no int"
+        self.assertTrue(is_sequence_of(int, sample=100, strategy="first")(data))
+        self.assertTrue(is_iterable_of(int, sample=100)(iter(data)))
+        data[0] = "no int"
+        for strategy in ("first", "stride"):
+            with self.assertRaises(TypeError) as context:
+                is_sequence_of(int, sample=100, strategy=strategy)(data)
+            self.assertIn("index 0", str(context.exception))
+            self.assertIn("sampling was in effect", str(context.exception))
+        # a random sample of all but one element has to hit one of the two wrong ones
+        with self.assertRaises(TypeError):
+            is_sequence_of(int, sample=9_999, strategy="random")(data)
+        # sequences shorter than the sample are checked completely
+        self.assertTrue(is_sequence_of(int, sample=100)([1, 2, 3]))
+        with self.assertRaises(ValueError):
+            is_sequence_of(int, sample=0)
+        with self.assertRaises(ValueError):
+            is_iterable_of(int, sample=10, strategy="last")
+
+    def test_stream(self):
+        consumed = []
+
+        for compile in (False, True):
+
+            @check_types(compile=compile, records=is_iterable_of(int, stream=True))
+            def foo(records: Iterable[int], limit: int = 3):
+                consumed.extend(islice(records, limit))
+                return True
+
+            def generate():
+                yield from (1, 2, 3, "no int")
+
+            # only the consumed elements are validated
+            self.assertEqual(foo(generate()), True)
+            self.assertEqual(foo(records=generate()), True)
+            with self.assertRaises(TypeError) as context:
+                foo(generate(), limit=10)
+            self.assertIn("index 3", str(context.exception))
+            # other iterables are checked before the call
+            with self.assertRaises(TypeError):
+                foo([1, 2, "no int"])
+        self.assertEqual(consumed, [1, 2, 3] * 6)
+
+    def test_stream_variadic(self):
+        def generate():
+            yield from (1, 2, "no int")
+
+        stream = is_iterable_of(int, stream=True)
+
+        for compile in (False, True):
+
+            @check_types(compile=compile, args=stream, kwargs=stream)
+            def foo(*args, **kwargs):
+                return [list(records) for records in (*args, *kwargs.values())]
+
+            self.assertEqual(foo([1], x=(2,)), [[1], [2]])
+            for args, kwargs in (((generate(),), {}), (([1], generate()), {}), ((), {"x": generate()})):
+                with self.assertRaisesRegex(TypeError, "index 2"):
+                    foo(*args, **kwargs)
+            with self.assertRaises(TypeError):
+                foo([1], x=[2, "no int"])
+
 
 if __name__ == "__main__":
     unittest.main()